@@ -43,6 +43,21 @@ def create_app(config_name=None):
     login_manager.init_app(app)
     mail.init_app(app)  # <-- Attach mail to app
 
+    from utils.cache import aggregate_cache
+    aggregate_cache.configure(
+        maxsize=app.config['AGGREGATE_CACHE_MAXSIZE'],
+        ttl=app.config['AGGREGATE_CACHE_TTL']
+    )
+
+    from utils.static_files import init_static_files
+    init_static_files(app)
+
+    from utils.jobs import job_runner
+    job_runner.init_app(app)
+
+    from utils.activity_log import activity_log
+    activity_log.init_app(app)
+
     # -------------------------------------------------
     # Flask-Login Configuration
     # -------------------------------------------------
@@ -0,0 +1,43 @@
+from app import create_app, db
+
+# Sarees updated per transaction
+BATCH_SIZE = 500
+
+
+def backfill_saree_colors():
+    """Store canonical color names and *_hex values on existing sarees"""
+    app = create_app()
+
+    with app.app_context():
+        from models.loom import SareeEntry
+        from utils.colors import apply_saree_colors
+
+        last_id = 0
+        updated = 0
+
+        try:
+            while True:
+                batch = (
+                    SareeEntry.query.filter(SareeEntry.id > last_id)
+                    .order_by(SareeEntry.id)
+                    .limit(BATCH_SIZE)
+                    .all()
+                )
+                if not batch:
+                    break
+
+                for saree in batch:
+                    apply_saree_colors(saree)
+
+                last_id = batch[-1].id
+                updated += len(batch)
+                db.session.commit()
+
+            print(f"Saree colors backfilled for {updated} saree(s).")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"Saree color backfill failed: {str(e)}")
+
+if __name__ == '__main__':
+    backfill_saree_colors()
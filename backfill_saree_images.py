@@ -0,0 +1,62 @@
+from app import create_app, db
+
+# Sarees updated per transaction (each one may resize an image)
+BATCH_SIZE = 100
+
+
+def backfill_saree_images():
+    """Generate thumb / medium variants for saree images uploaded before the pipeline"""
+    app = create_app()
+
+    with app.app_context():
+        from models.loom import SareeEntry
+        from utils.images import make_image_variants
+
+        upload_folder = app.config['UPLOAD_FOLDER']
+        last_id = 0
+        updated = 0
+        skipped = 0
+
+        try:
+            while True:
+                batch = (
+                    SareeEntry.query.filter(
+                        SareeEntry.id > last_id,
+                        SareeEntry.saree_image.isnot(None),
+                        SareeEntry.saree_thumb.is_(None)
+                    )
+                    .order_by(SareeEntry.id)
+                    .limit(BATCH_SIZE)
+                    .all()
+                )
+                if not batch:
+                    break
+
+                # Same upload shared by several sarees → resize it once
+                variants_by_file = {}
+
+                for saree in batch:
+                    if saree.saree_image not in variants_by_file:
+                        variants_by_file[saree.saree_image] = make_image_variants(upload_folder, saree.saree_image)
+
+                    variants = variants_by_file[saree.saree_image]
+                    if not variants:
+                        # Missing file, PDF or unreadable image
+                        skipped += 1
+                        continue
+
+                    saree.saree_thumb = variants["thumb"]
+                    saree.saree_medium = variants["medium"]
+                    updated += 1
+
+                last_id = batch[-1].id
+                db.session.commit()
+
+            print(f"Image variants generated for {updated} saree(s), {skipped} skipped.")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"Saree image backfill failed: {str(e)}")
+
+if __name__ == '__main__':
+    backfill_saree_images()
@@ -0,0 +1,166 @@
+import re
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+from sqlalchemy import text, insert
+from app import create_app, db
+from utils.check_fixtures import LOOM_NO_BASE, add_check_user
+
+# Seed size: enough rows that the planner, at its default settings,
+# picks an index only where one really pays off
+SEED_LOOMS_PER_TYPE = 50
+SEED_SAREES_PER_LOOM = 200   # one per day going back, so also the days covered
+
+# A full scan of the table in the plan, per dialect
+FULL_SCAN = {
+    "postgresql": r"Seq Scan on {table}\b",
+    "sqlite": r"\bSCAN {table}\b(?! USING)",
+}
+
+
+def plan_checks(loom, user):
+    """
+    (access path, the ORM query the app runs, table that must not be fully
+    scanned, indexes of which one must appear in the plan)
+    """
+    from controllers.loom_controller import loom_sarees_query, saree_listing_queries
+    from controllers.payments_controller import payments_on_day_query, payment_dates_query, visible_loom_types
+
+    today = date.today()
+    listing = saree_listing_queries(
+        loom.loom_type, user,
+        filter_date=today - timedelta(days=30),
+        before=today - timedelta(days=7)
+    )
+    visible_types = visible_loom_types(user.role)
+
+    return [
+        (
+            "view_loom / download: sarees of one loom by saree_number",
+            loom_sarees_query(loom.id),
+            "saree_entries",
+            ["ix_saree_entries_loom_id_saree_number"],
+        ),
+        (
+            "saree listing: page dates (DISTINCT, keyset, LIMIT)",
+            listing["dates"],
+            "saree_entries",
+            ["ix_saree_entries_loom_id_date"],
+        ),
+        (
+            "saree listing: sarees of the page",
+            listing["sarees"](today - timedelta(days=14)),
+            "saree_entries",
+            ["ix_saree_entries_loom_id_date"],
+        ),
+        (
+            "saree listing: count older than the range",
+            listing["hidden"],
+            "saree_entries",
+            ["ix_saree_entries_loom_id_date"],
+        ),
+        (
+            "payments_by_date: payments of one day",
+            payments_on_day_query(today, visible_types, user),
+            "payments",
+            ["ix_payments_date_loom_id"],
+        ),
+        (
+            "list_payment_dates: daily summary",
+            payment_dates_query(visible_types, user),
+            "payment_daily_summary",
+            ["ix_payment_daily_summary_user_id_date"],
+        ),
+    ]
+
+
+def seed():
+    """Insert throwaway rows inside the current transaction (rolled back later)."""
+    from models.loom import Loom, SareeEntry
+    from models.loom_types import LOOM_TYPES, HANDLOOM
+    from models.payments import Payment, PaymentDailySummary
+
+    user = add_check_user("plan", "handloom_factory")
+
+    looms = [
+        Loom(loom_no=LOOM_NO_BASE + n, loom_type=loom_type, num_sarees=SEED_SAREES_PER_LOOM, user_id=user.id)
+        for loom_type in LOOM_TYPES
+        for n in range(SEED_LOOMS_PER_TYPE)
+    ]
+    db.session.add_all(looms)
+    db.session.flush()
+
+    sarees = []
+    payments = []
+    summary = defaultdict(lambda: [0, 0.0])
+    for loom in looms:
+        for i in range(SEED_SAREES_PER_LOOM):
+            day = date.today() - timedelta(days=i)
+            sarees.append({"loom_id": loom.id, "saree_number": i + 1, "date": day})
+            payments.append({"loom_id": loom.id, "amount": 100, "payment_type": "debit", "date": day})
+            summary[(day, loom.loom_type)][0] += 1
+            summary[(day, loom.loom_type)][1] += 100
+
+    # Bulk inserts: no counter / summary listeners, the summary rows are added directly
+    db.session.execute(insert(SareeEntry), sarees)
+    db.session.execute(insert(Payment), payments)
+    db.session.execute(insert(PaymentDailySummary), [
+        {"date": day, "user_id": user.id, "loom_type": loom_type, "payment_count": count, "total_amount": amount}
+        for (day, loom_type), (count, amount) in summary.items()
+    ])
+
+    db.session.flush()
+    first_handloom = next(loom for loom in looms if loom.loom_type == HANDLOOM)
+    return first_handloom, user
+
+
+def compile_sql(query, dialect):
+    """The SQL the app sends for this query, with its parameters inlined."""
+    statement = getattr(query, "statement", query)
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def explain(conn, sql):
+    prefix = "EXPLAIN " if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    rows = conn.exec_driver_sql(prefix + sql)
+    return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+
+def check_index_plans():
+    """EXPLAIN the app's own queries against a seeded database and check the index used"""
+    app = create_app()
+    failures = 0
+
+    with app.app_context():
+        try:
+            loom, user = seed()
+            conn = db.session.connection()
+
+            # Fresh statistics for the seeded rows; planner settings stay at their defaults
+            if conn.dialect.name == "postgresql":
+                for table in ("looms", "saree_entries", "payments", "payment_daily_summary"):
+                    conn.execute(text(f"ANALYZE {table}"))
+            else:
+                conn.execute(text("ANALYZE"))
+
+            for name, query, table, indexes in plan_checks(loom, user):
+                plan = explain(conn, compile_sql(query, conn.dialect))
+                full_scan = re.search(FULL_SCAN[conn.dialect.name].format(table=table), plan)
+                uses_index = any(index in plan for index in indexes)
+
+                if full_scan or not uses_index:
+                    failures += 1
+                    problem = f"full scan of {table}" if full_scan else f"none of {', '.join(indexes)} used"
+                    print(f"❌ {name}: {problem}")
+                    print("   " + plan.replace("\n", "\n   "))
+                else:
+                    print(f"✅ {name}")
+
+        finally:
+            db.session.rollback()
+
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_index_plans() else 0)
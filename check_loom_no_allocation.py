@@ -0,0 +1,66 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app, db
+from utils.check_fixtures import check_user
+
+# Parallel creates against one throwaway loom type
+WORKERS = 16
+LOOMS = 200
+
+
+def create_loom(app, loom_type, user_id):
+    with app.app_context():
+        from models.loom import Loom, LoomNumberCounter
+
+        try:
+            loom_no = LoomNumberCounter.allocate(loom_type)
+            db.session.add(Loom(loom_no=loom_no, loom_type=loom_type, num_sarees=0, user_id=user_id))
+            db.session.commit()
+            return loom_no
+
+        except Exception as e:
+            db.session.rollback()
+            return e
+
+
+def check_loom_no_allocation():
+    """Create LOOMS looms from WORKERS threads and check every loom_no is unique and gap-free"""
+    app = create_app()
+    tag = os.urandom(4).hex()
+    loom_type = f"AllocCheck-{tag}"
+
+    with check_user(app, "alloc", "owner") as user_id:
+        try:
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                results = list(pool.map(lambda _: create_loom(app, loom_type, user_id), range(LOOMS)))
+
+            errors = [r for r in results if isinstance(r, Exception)]
+            numbers = sorted(r for r in results if not isinstance(r, Exception))
+
+            with app.app_context():
+                from models.loom import Loom
+
+                stored = sorted(
+                    no for (no,) in db.session.query(Loom.loom_no).filter(Loom.loom_type == loom_type)
+                )
+
+            ok = not errors and numbers == stored == list(range(1, LOOMS + 1))
+
+            print(f"{'✅' if ok else '❌'} {len(numbers)} looms created, {len(errors)} failed, "
+                  f"{len(set(stored))} distinct loom_no of {len(stored)} stored")
+            for e in errors[:5]:
+                print(f"   {type(e).__name__}: {e}")
+
+            return ok
+
+        finally:
+            with app.app_context():
+                from models.loom import LoomNumberCounter
+
+                LoomNumberCounter.query.filter_by(loom_type=loom_type).delete()
+                db.session.commit()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_loom_no_allocation() else 1)
@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import email
+import functools
+import threading
+import socketserver
+from app import create_app, mail
+from utils.jobs import job_runner
+
+ADMIN_EMAIL = "otp-admin@example.invalid"
+
+# Seconds to wait for a (retried) delivery to reach the stub
+DELIVERY_TIMEOUT = 15
+
+
+# ==========================================================
+#   LOCAL SMTP STUB
+# ==========================================================
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib; refuses the connection while fail_next > 0."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            refuse = server.fail_next > 0
+            if refuse:
+                server.fail_next -= 1
+
+        if refuse:
+            self.reply("421 4.3.2 Service not available, try again later")
+            return
+
+        self.reply("220 localhost SMTP stub")
+        data = None
+
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+
+            if data is not None:
+                if line == ".":
+                    with server.lock:
+                        server.messages.append("\r\n".join(data))
+                    data = None
+                    self.reply("250 2.0.0 queued")
+                else:
+                    data.append(line[1:] if line.startswith("..") else line)
+                continue
+
+            verb = line.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "DATA":
+                data = []
+                self.reply("354 end data with <CR><LF>.<CR><LF>")
+            elif verb == "QUIT":
+                self.reply("221 2.0.0 bye")
+                return
+            else:
+                self.reply("250 2.0.0 ok")
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPStubHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.fail_next = 0
+        self.messages = []
+
+    def reset(self, fail_next=0):
+        with self.lock:
+            self.connections = 0
+            self.fail_next = fail_next
+            self.messages = []
+
+    def wait_for_message(self, timeout=DELIVERY_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if self.messages:
+                    return email.message_from_string(self.messages[0])
+            time.sleep(0.05)
+        return None
+
+
+# ==========================================================
+#   CHECKS
+# ==========================================================
+def register(app, tag):
+    """POST /register like the form does; returns the OTP kept in the session."""
+    client = app.test_client()
+    client.post("/register", data={
+        "firstname": "otp",
+        "lastname": "check",
+        "username": f"otpcheck_{tag}",
+        "email": f"otpcheck_{tag}@example.invalid",
+        "password": tag,
+        "confirm_password": tag,
+        "role": "handloom_factory",
+    })
+
+    with client.session_transaction() as session:
+        return session.get("reg_otp")
+
+
+def delivered_otp(message):
+    if message is None:
+        return None
+    body = message.get_payload(decode=True) or b""
+    return body.decode("utf-8", "replace").rsplit(":", 1)[-1].strip()
+
+
+def check_otp_delivery():
+    """Register against a local SMTP stub and check the OTP mail arrives, also after a refused connection"""
+    app = create_app()
+    stub = SMTPStub()
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    app.config.update(
+        TESTING=True,
+        MAIL_SERVER="127.0.0.1",
+        MAIL_PORT=stub.server_address[1],
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_USERNAME=None,
+        MAIL_PASSWORD=None,
+        MAIL_DEFAULT_SENDER="otp-check@example.invalid",
+        MAIL_SUPPRESS_SEND=False,
+        MAIL_DEBUG=False,
+        JOB_RUNNER="thread",
+        JOB_MAX_RETRIES=3,
+        JOB_RETRY_BACKOFF=0.2,
+    )
+    mail.init_app(app)
+    job_runner.init_app(app)
+
+    saved_admin = os.environ.get("OTP_ADMIN_EMAIL")
+    os.environ["OTP_ADMIN_EMAIL"] = ADMIN_EMAIL
+    results = []
+
+    try:
+        # 1. Straight delivery
+        stub.reset()
+        otp = register(app, os.urandom(4).hex())
+        message = stub.wait_for_message()
+        ok = otp is not None and delivered_otp(message) == otp and message["To"] == ADMIN_EMAIL
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} OTP mail delivered to the stub ({stub.connections} connection(s))")
+
+        # 2. First connection refused (421), delivered on the retry
+        stub.reset(fail_next=1)
+        otp = register(app, os.urandom(4).hex())
+        message = stub.wait_for_message()
+        ok = otp is not None and delivered_otp(message) == otp and stub.connections == 2
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} OTP mail delivered after a transient failure "
+              f"({stub.connections} connection(s))")
+
+        # 3. Missing OTP_ADMIN_EMAIL fails once, without retries
+        import controllers.auth_controller as auth_controller
+
+        send_otp_email = auth_controller.send_otp_email
+        attempts = []
+
+        @functools.wraps(send_otp_email)
+        def counted(otp):
+            attempts.append(otp)
+            return send_otp_email(otp)
+
+        del os.environ["OTP_ADMIN_EMAIL"]
+        auth_controller.send_otp_email = counted
+        try:
+            stub.reset()
+            register(app, os.urandom(4).hex())
+            time.sleep(job_runner.backoff * 2 ** job_runner.max_retries)
+        finally:
+            auth_controller.send_otp_email = send_otp_email
+
+        ok = len(attempts) == 1 and stub.connections == 0
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} missing OTP_ADMIN_EMAIL not retried ({len(attempts)} attempt(s))")
+
+        return all(results)
+
+    finally:
+        if saved_admin is None:
+            os.environ.pop("OTP_ADMIN_EMAIL", None)
+        else:
+            os.environ["OTP_ADMIN_EMAIL"] = saved_admin
+        stub.shutdown()
+        stub.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_otp_delivery() else 1)
@@ -0,0 +1,95 @@
+import sys
+from sqlalchemy import event
+from app import create_app, db
+from models.loom_types import LOOM_TYPES
+from utils.check_fixtures import LOOM_NO_BASE, check_user
+
+# Pages that list looms / weavers; their query count must not grow with the rows
+PAGES = (
+    "/loom/handlooms",
+    "/loom/powerlooms",
+    "/loom/outsidelooms",
+    "/loom/outside_powerlooms",
+    "/loom/handloom/create",
+    "/loom/powerloom/create",
+    "/loom/outsideloom/create",
+    "/loom/outside_powerloom/create",
+    "/weaver/",
+)
+
+# Weavers (each with one loom per type) before / after growing the data
+SMALL = 2
+LARGE = 25
+
+
+def add_records(user_id, start, count):
+    from models.loom import Loom
+    from models.weaver import Weaver
+
+    for i in range(start, start + count):
+        weaver = Weaver(weavername=f"qcheck {i}", phonenumber=f"qc{i}", user_id=user_id)
+        db.session.add(weaver)
+        db.session.flush()
+
+        for loom_type in LOOM_TYPES:
+            db.session.add(Loom(
+                loom_no=LOOM_NO_BASE + user_id * 1000 + i,
+                loom_type=loom_type,
+                num_sarees=0,
+                weaver_id=weaver.id,
+                user_id=user_id
+            ))
+
+    db.session.commit()
+
+
+def count_queries(engine, client, path):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return response.status_code, len(statements)
+
+
+def check_query_counts():
+    """Render each list page with SMALL and LARGE weavers/looms and check the query count stays the same"""
+    app = create_app()
+
+    with check_user(app, "query", "handloom_factory") as user_id:
+        with app.app_context():
+            engine = db.engine
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["_user_id"] = str(user_id)
+            session["_fresh"] = True
+
+        with app.app_context():
+            add_records(user_id, 0, SMALL)
+        small = {path: count_queries(engine, client, path) for path in PAGES}
+
+        with app.app_context():
+            add_records(user_id, SMALL, LARGE - SMALL)
+        large = {path: count_queries(engine, client, path) for path in PAGES}
+
+        ok = True
+        for path in PAGES:
+            (small_status, small_count), (large_status, large_count) = small[path], large[path]
+            page_ok = small_status == large_status == 200 and small_count == large_count
+            ok = ok and page_ok
+
+            print(f"{'✅' if page_ok else '❌'} {path}: {small_count} queries with {SMALL} weavers, "
+                  f"{large_count} with {LARGE} (HTTP {small_status}/{large_status})")
+
+        return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_query_counts() else 1)
@@ -0,0 +1,59 @@
+import os
+import sys
+from app import create_app
+
+
+def cleanup_orphan_uploads(dry_run=False):
+    """
+    Delete files in the content-addressed upload store (and their image
+    variants) that no saree or weaver references any more.
+
+    Files touched within UPLOAD_GRACE_SECONDS are skipped, so uploads still
+    in flight are never removed. Pass --dry-run to only list what would go.
+    """
+    app = create_app()
+
+    with app.app_context():
+        from utils.uploads import UPLOAD_STORE_DIR, referenced_uploads, is_stale
+        from utils.images import VARIANTS_DIR
+
+        upload_folder = app.config['UPLOAD_FOLDER']
+        deleted = 0
+        kept = 0
+
+        try:
+            # Scan files first: anything uploaded after this point is not a candidate
+            candidates = []
+            for top in (UPLOAD_STORE_DIR, os.path.join(VARIANTS_DIR, UPLOAD_STORE_DIR)):
+                for dirpath, _, filenames in os.walk(os.path.join(upload_folder, top)):
+                    for name in filenames:
+                        full_path = os.path.join(dirpath, name)
+                        candidates.append((os.path.relpath(full_path, upload_folder).replace(os.sep, "/"), full_path))
+
+            referenced = referenced_uploads()
+
+            for path, full_path in candidates:
+                # Checked after the reference scan: a duplicate upload whose row
+                # is not committed yet has just refreshed the mtime. Left-over
+                # temp files of interrupted uploads are never referenced.
+                if path in referenced or not is_stale(full_path):
+                    kept += 1
+                    continue
+
+                deleted += 1
+                if dry_run:
+                    print(f"would delete {path}")
+                    continue
+
+                try:
+                    os.remove(full_path)
+                except FileNotFoundError:
+                    pass
+
+            print(f"Orphan uploads {'found' if dry_run else 'deleted'}: {deleted} ({kept} kept).")
+
+        except Exception as e:
+            print(f"Orphan upload cleanup failed: {str(e)}")
+
+if __name__ == '__main__':
+    cleanup_orphan_uploads(dry_run='--dry-run' in sys.argv)
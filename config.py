@@ -47,6 +47,42 @@ class Config:
     OTP_ADMIN_EMAIL = os.getenv("OTP_ADMIN_EMAIL", MAIL_USERNAME)
     OTP_EXPIRY_MINUTES = int(os.getenv("OTP_EXPIRY_MINUTES", 5))
 
+    # =================================================
+    # AGGREGATE CACHE (dashboard tiles, warp-low list)
+    # =================================================
+    AGGREGATE_CACHE_TTL = int(os.getenv("AGGREGATE_CACHE_TTL", 30))
+    AGGREGATE_CACHE_MAXSIZE = int(os.getenv("AGGREGATE_CACHE_MAXSIZE", 512))
+
+    # =================================================
+    # NOTIFICATIONS
+    # =================================================
+    # Server-sent events hold a worker per open tab: only enable them with
+    # an async worker class (gunicorn -k gevent). Otherwise pages poll.
+    NOTIFICATION_STREAM = os.getenv("NOTIFICATION_STREAM", "False").lower() == "true"
+
+    # =================================================
+    # BACKGROUND JOBS (OTP email / SMS delivery)
+    # =================================================
+    JOB_RUNNER = os.getenv("JOB_RUNNER", "thread")        # "thread" or "inline"
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_MAX_RETRIES = int(os.getenv("JOB_MAX_RETRIES", 5))
+    JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", 2))   # seconds, doubled per retry
+
+    # =================================================
+    # ACTIVITY LOG (buffered, multi-row inserts)
+    # =================================================
+    ACTIVITY_FLUSH_SIZE = int(os.getenv("ACTIVITY_FLUSH_SIZE", 50))
+    ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", 5))   # seconds
+
+    # =================================================
+    # STATIC FILES / UPLOADS
+    # =================================================
+    # Let the front server send file bodies: X-Sendfile (Apache / lighttpd)
+    # or nginx X-Accel-Redirect to an internal location aliasing static/,
+    # e.g. STATIC_ACCEL_REDIRECT_PREFIX=/_static/
+    USE_X_SENDFILE = os.getenv("USE_X_SENDFILE", "False").lower() == "true"
+    STATIC_ACCEL_REDIRECT_PREFIX = os.getenv("STATIC_ACCEL_REDIRECT_PREFIX")
+
 
 # ========== DEBUG PRINTS ==========
 print("========= CONFIG DEBUG =========")
@@ -1,8 +1,13 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash
 from models.user import User, Activity
 from app import db, mail
+from controllers import dashboard_controller
+from utils.cache import aggregate_cache
+from utils.role_utils import owner_or_403
+from utils.jobs import job_runner, PermanentJobError
+from utils.activity_log import activity_log
 from datetime import datetime
 from flask_mail import Message
 import random
@@ -17,7 +22,8 @@ def send_otp_email(otp):
     admin_email = os.getenv("OTP_ADMIN_EMAIL")
 
     if not admin_email:
-        raise Exception("OTP_ADMIN_EMAIL is not set!")
+        # Configuration, not a delivery problem: retrying won't help
+        raise PermanentJobError("OTP_ADMIN_EMAIL is not set!")
 
     msg = Message(
         subject="BBBS Registration OTP",
@@ -61,12 +67,8 @@ def login():
 
             login_user(user)
 
-            db.session.add(Activity(
-                user_id=user.id,
-                username=user.username,
-                action="login"
-            ))
-            db.session.commit()
+            # Buffered: written with other activities in one multi-row insert
+            activity_log.record(user.id, user.username, "login")
 
             flash('Login successful!', 'success')
             next_page = request.args.get('next')
@@ -122,7 +124,8 @@ def register():
         }
         session['reg_otp'] = otp
 
-        send_otp_email(otp)
+        # Delivered in the background (retried if the mail server is slow / down)
+        job_runner.enqueue(send_otp_email, otp)
         flash('OTP sent to admin email', 'info')
 
         return redirect(url_for('auth.verify_otp'))
@@ -136,6 +139,7 @@ def activities():
         flash("Access denied", "danger")
         return redirect(url_for('auth.dashboard'))
 
+    activity_log.flush()
     activities = Activity.query.order_by(Activity.timestamp.desc()).all()
     return render_template(
         "activities.html",
@@ -172,12 +176,7 @@ def verify_otp():
         db.session.add(user)
         db.session.commit()
 
-        db.session.add(Activity(
-            user_id=user.id,
-            username=user.username,
-            action="register"
-        ))
-        db.session.commit()
+        activity_log.record(user.id, user.username, "register")
 
         session.clear()
 
@@ -193,12 +192,14 @@ def verify_otp():
 @auth_bp.route('/dashboard')
 @login_required
 def dashboard():
-    if current_user.role == "owner":
-        users = User.query.all()
-        activities = Activity.query.order_by(Activity.timestamp.desc()).limit(5).all()
-        return render_template("dashboards/owner_dashboard.html", users=users, recent_activities=activities)
+    return dashboard_controller.dashboard()
 
-    return render_template(f"dashboards/{current_user.role}_dashboard.html")
+
+@auth_bp.route('/dashboard/cache-stats')
+@login_required
+def cache_stats():
+    owner_or_403()
+    return jsonify(aggregate_cache.stats())
 
 
 # ---------------------------------------------------
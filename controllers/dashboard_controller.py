@@ -1,69 +1,84 @@
 from flask import render_template
 from flask_login import login_required, current_user
-from app.models.weaver import Weaver
-from app.models.loom import Loom
-from app.models.payments import Payment
+from sqlalchemy import func, case, select
+from app import db
+from models.user import User, Activity
+from models.weaver import Weaver
+from models.loom import Loom
+from models.loom_types import HANDLOOM, POWERLOOM, OUTSIDE_HANDLOOM, OUTSIDE_POWERLOOM
+from models.payments import Payment
+from utils.cache import cached_aggregate
+from utils.activity_log import activity_log
 
 
-@login_required
-def dashboard():
+# Dashboard tile → Loom.loom_type
+LOOM_TYPE_TILES = {
+    "handlooms_count": HANDLOOM,
+    "powerlooms_count": POWERLOOM,
+    "outside_looms_count": OUTSIDE_HANDLOOM,
+    "outside_powerlooms_count": OUTSIDE_POWERLOOM,
+}
+
+
+def get_dashboard_counts(user):
     """
-    Owner = sees everything  
-    Other users = see only their looms, payments, and weavers
+    All dashboard tiles in one round trip: per-loom-type counts are
+    aggregated over looms, weavers / payments / users come in as scalar
+    subqueries.
     """
+    is_owner = user.role == "owner"
 
-    # -----------------------------------------------------
-    # OWNER → FULL ACCESS
-    # -----------------------------------------------------
-    if current_user.role == "owner":
+    weavers_q = select(func.count(Weaver.id))
+    payments_q = select(func.count(Payment.id))
 
-        weavers_count = Weaver.query.count()
-        payments_count = Payment.query.count()
+    if not is_owner:
+        weavers_q = weavers_q.where(Weaver.user_id == user.id)
+        payments_q = (
+            payments_q.join(Loom, Payment.loom_id == Loom.id)
+            .where(Loom.user_id == user.id)
+        )
 
-        handlooms_count = Loom.query.filter_by(loom_type="handloom_factory").count()
-        powerlooms_count = Loom.query.filter_by(loom_type="powerloom_factory").count()
-        outside_looms_count = Loom.query.filter_by(loom_type="outside_handloom").count()
-        outside_powerlooms_count = Loom.query.filter_by(loom_type="outside_powerloom").count()
+    columns = [
+        func.coalesce(func.sum(case((Loom.loom_type == loom_type, 1), else_=0)), 0).label(tile)
+        for tile, loom_type in LOOM_TYPE_TILES.items()
+    ]
+    columns += [
+        func.coalesce(func.sum(Loom.sarees_added), 0).label("sarees_count"),
+        weavers_q.scalar_subquery().label("weavers_count"),
+        payments_q.scalar_subquery().label("payments_count"),
+    ]
 
-    # -----------------------------------------------------
-    # NORMAL USER → RESTRICTED ACCESS
-    # -----------------------------------------------------
-    else:
-        weavers_count = Weaver.query.filter_by(user_id=current_user.id).count()
+    if is_owner:
+        columns.append(select(func.count(User.id)).scalar_subquery().label("users_count"))
 
-        payments_count = (
-            Payment.query.join(Loom, Payment.loom_id == Loom.id)
-            .filter(Loom.user_id == current_user.id)
-            .count()
-        )
+    stmt = select(*columns).select_from(Loom)
+    if not is_owner:
+        stmt = stmt.where(Loom.user_id == user.id)
 
-        handlooms_count = Loom.query.filter_by(
-            user_id=current_user.id, 
-            loom_type="handloom_factory"
-        ).count()
+    return dict(db.session.execute(stmt).one()._mapping)
 
-        powerlooms_count = Loom.query.filter_by(
-            user_id=current_user.id, 
-            loom_type="powerloom_factory"
-        ).count()
 
-        outside_looms_count = Loom.query.filter_by(
-            user_id=current_user.id, 
-            loom_type="outside_handloom"
-        ).count()
+@login_required
+def dashboard():
+    """
+    Owner = sees everything
+    Other users = see only their looms, payments, and weavers
+    """
+    counts = cached_aggregate("dashboard", current_user, lambda: get_dashboard_counts(current_user))
 
-        outside_powerlooms_count = Loom.query.filter_by(
-            user_id=current_user.id, 
-            loom_type="outside_powerloom"
-        ).count()
+    # -----------------------------------------------------
+    # OWNER → FULL ACCESS (+ latest activity)
+    # -----------------------------------------------------
+    if current_user.role == "owner":
+        activity_log.flush()
+        activities = Activity.query.order_by(Activity.timestamp.desc()).limit(5).all()
+        return render_template(
+            "dashboards/owner_dashboard.html",
+            recent_activities=activities,
+            **counts
+        )
 
     # -----------------------------------------------------
-    return render_template(
-        "owner_dashboard.html",
-        weavers_count=weavers_count,
-        payments_count=payments_count,
-        handlooms_count=handlooms_count,
-        powerlooms_count=powerlooms_count,
-        outside_looms_count=outside_looms_count,
-        outside_powerlooms_count=outside_powerlooms_count,
-    )
+    # NORMAL USER → RESTRICTED ACCESS
+    # -----------------------------------------------------
+    return render_template(f"dashboards/{current_user.role}_dashboard.html", **counts)
@@ -1,38 +1,161 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, json, request, current_app, stream_with_context, abort
+from flask_login import login_required, current_user
 from app import db
 from models.loom import Loom
+from utils.cache import cached_aggregate
+import hashlib
+import threading
+import time
 
 notification_bp = Blueprint("notifications", __name__, url_prefix="/notifications")
 
+# Notify when exactly this many sarees are left on a loom's warp
+WARP_LOW_REMAINING = 2
+
+# Stream timings (seconds)
+STREAM_HEARTBEAT_SECONDS = 25   # also how often changes from other workers are picked up
+STREAM_MAX_SECONDS = 300        # then the browser reconnects (EventSource retry)
+
+
+# ==========================================================
+#   CHANGE SIGNAL (bumped by add_saree / edit_loom / delete_loom)
+# ==========================================================
+_changes = threading.Condition()
+_version = 0
+
+
+def notify_warp_change():
+    """
+    Call after committing a write that changes a loom's remaining saree
+    count. Wakes up open streams so they re-read the notifications.
+    """
+    global _version
+    with _changes:
+        _version += 1
+        _changes.notify_all()
+
+
+def _wait_for_change(seen, timeout):
+    with _changes:
+        _changes.wait_for(lambda: _version != seen, timeout=timeout)
+        return _version
+
+
+def _etag_for(payload):
+    """ETag from the notification list itself, so every worker agrees on it."""
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# ==========================================================
+#   WARP-LOW QUERY
+# ==========================================================
+def get_warp_low_looms():
+    """
+    Looms (scoped like get_allowed_looms) with exactly WARP_LOW_REMAINING
+    sarees left, read straight from the Loom saree counters.
+    """
+    remaining = Loom.num_sarees - Loom.sarees_added
+
+    q = (
+        db.session.query(Loom.id, Loom.loom_no, remaining.label("remaining"))
+        .filter(remaining == WARP_LOW_REMAINING)
+    )
+
+    # Owner → all looms, others → own looms
+    if current_user.role != "owner":
+        q = q.filter(Loom.user_id == current_user.id)
+
+    return q.order_by(Loom.id).all()
+
+
+def build_notifications():
+    return cached_aggregate("notifications", current_user, _build_notifications)
+
+
+def _build_notifications():
+    notifications = [
+        {
+            "loom_id": row.id,
+            "loom_no": row.loom_no,
+            "message": f"Loom {row.loom_no} needs a new warp — only {row.remaining} sarees remaining!"
+        }
+        for row in get_warp_low_looms()
+    ]
+
+    return {
+        "count": len(notifications),
+        "notifications": notifications
+    }
+
+
+# ==========================================================
+#   POLLING ENDPOINT (ETag / 304 aware)
+# ==========================================================
 @notification_bp.route("/", methods=["GET"])
+@login_required
 def get_notifications():
     """
     Returns notification messages when only 2 sarees are left for a loom.
+    Answers 304 when the list matches the client's If-None-Match; the
+    ETag is a hash of the list, so it is the same on every worker.
     """
     try:
-        looms = Loom.query.all()
-        notifications = []
+        payload = build_notifications()
+        etag = _etag_for(payload)
 
-        for loom in looms:
-            total_sarees = loom.num_sarees or 0
+        if etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify(payload)
 
-            # Force load saree entries
-            added_sarees = len(loom.saree_entries) if loom.saree_entries else 0
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
-            remaining = total_sarees - added_sarees
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-            # Trigger only when exactly 2 sarees are remaining
-            if remaining == 2:
-                notifications.append({
-                    "loom_id": loom.id,
-                    "loom_no": loom.loom_no,
-                    "message": f"Loom {loom.loom_no} needs a new warp — only {remaining} sarees remaining!"
-                })
 
-        return jsonify({
-            "count": len(notifications),
-            "notifications": notifications
-        })
+# ==========================================================
+#   SERVER-SENT EVENTS STREAM
+# ==========================================================
+@notification_bp.route("/stream", methods=["GET"])
+@login_required
+def stream_notifications():
+    """
+    Server-Sent Events stream of warp-low notifications (NOTIFICATION_STREAM
+    only). Sends the current list on connect, then re-reads it after each
+    change in this worker or every heartbeat, and sends it when it changed
+    (a comment ping otherwise). Ends after STREAM_MAX_SECONDS so a worker
+    is never held by one tab indefinitely; the browser reconnects.
+    """
+    if not current_app.config.get("NOTIFICATION_STREAM"):
+        abort(404)
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+    def events():
+        seen = _version
+        last_payload = None
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+
+        yield f"retry: {STREAM_HEARTBEAT_SECONDS * 1000}\n\n"
+
+        while time.monotonic() < deadline:
+            payload = json.dumps(build_notifications())
+            # Don't hold a DB connection while waiting
+            db.session.remove()
+
+            if payload != last_payload:
+                last_payload = payload
+                yield f"event: notifications\ndata: {payload}\n\n"
+            else:
+                yield ": ping\n\n"
+
+            seen = _wait_for_change(seen, STREAM_HEARTBEAT_SECONDS)
+
+    response = current_app.response_class(
+        stream_with_context(events()),
+        mimetype="text/event-stream"
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -1,11 +1,13 @@
 from flask import Blueprint, render_template, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
-from models.payments import Payment
+from models.payments import Payment, PaymentDailySummary
 from models.loom import Loom
+from models.loom_types import HANDLOOM, POWERLOOM, OUTSIDE_HANDLOOM, OUTSIDE_POWERLOOM
 from models.weaver import Weaver
-from datetime import datetime
-from sqlalchemy import cast, Date
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from sqlalchemy.orm import contains_eager
 
 payments_bp = Blueprint("payments", __name__, url_prefix="/payments")
 
@@ -13,8 +15,89 @@ payments_bp = Blueprint("payments", __name__, url_prefix="/payments")
 # -------------------------------------------------------------
 # ROLE HELPER
 # -------------------------------------------------------------
+def role_of(user):
+    return (getattr(user, "role", "") or "").lower()
+
+
 def role():
-    return getattr(current_user, "role", "").lower()
+    return role_of(current_user)
+
+
+# -------------------------------------------------------------
+# PAYMENT CATEGORIES
+# -------------------------------------------------------------
+# Category (template section) → Loom.loom_type
+PAYMENT_CATEGORIES = {
+    "handloom": HANDLOOM,
+    "powerloom": POWERLOOM,
+    "outside_handloom": OUTSIDE_HANDLOOM,
+    "outside_powerloom": OUTSIDE_POWERLOOM,
+}
+
+# Role → categories it may see
+ROLE_CATEGORIES = {
+    "owner": list(PAYMENT_CATEGORIES),
+    "handloom_factory": ["handloom"],
+    "powerloom_factory": ["powerloom"],
+    "outside_handloom": ["outside_handloom"],
+    "outside_powerloom": ["outside_powerloom"],
+}
+
+
+def visible_loom_types(user_role):
+    """Loom.loom_type → category for what this role may see (None: unknown role)."""
+    categories = ROLE_CATEGORIES.get(user_role)
+    if not categories:
+        return None
+    return {PAYMENT_CATEGORIES[c]: c for c in categories}
+
+
+# -------------------------------------------------------------
+# DAY RANGE (index-friendly: plain range predicate on Payment.date)
+# -------------------------------------------------------------
+def on_day(day):
+    return (Payment.date >= day) & (Payment.date < day + timedelta(days=1))
+
+
+# -------------------------------------------------------------
+# QUERIES (also EXPLAINed by check_index_plans.py)
+# -------------------------------------------------------------
+def payments_on_day_query(day, visible_types, user):
+    """
+    (Payment, Loom.loom_type) for the day's payments of the visible loom
+    types: the same payments payment_dates_query counts, with or without
+    a weaver.
+    """
+    q = (
+        db.session.query(Payment, Loom.loom_type)
+        .join(Loom, Payment.loom_id == Loom.id)
+        .outerjoin(Weaver, Payment.weaver_id == Weaver.id)
+        .filter(on_day(day))
+        .filter(Loom.loom_type.in_(visible_types))
+    )
+
+    if role_of(user) != "owner":
+        q = q.filter(Loom.user_id == user.id)
+    return q
+
+
+def payment_dates_query(visible_types, user):
+    """Days with payments, newest first, with their count and total (daily summary)."""
+    q = (
+        db.session.query(
+            PaymentDailySummary.date.label("d"),
+            func.sum(PaymentDailySummary.payment_count).label("payment_count"),
+            func.sum(PaymentDailySummary.total_amount).label("total_amount")
+        )
+        .filter(PaymentDailySummary.loom_type.in_(visible_types))
+        .group_by(PaymentDailySummary.date)
+        .having(func.sum(PaymentDailySummary.payment_count) > 0)
+        .order_by(PaymentDailySummary.date.desc())
+    )
+
+    if role_of(user) != "owner":
+        q = q.filter(PaymentDailySummary.user_id == user.id)
+    return q
 
 
 # -------------------------------------------------------------
@@ -31,103 +114,50 @@ def payments_by_date(date_str):
         flash("Invalid date format.", "danger")
         return redirect(url_for("payments.list_payment_dates"))
 
-    # Base query (all payments for that date)
-    base_q = (
-        Payment.query
-        .join(Loom, Payment.loom_id == Loom.id)
-        .join(Weaver, Payment.weaver_id == Weaver.id)
-        .filter(cast(Payment.date, Date) == selected_date)   # <-- FIXED
-    )
-
     user_role = role()
 
-    # ---------------------------------------------------------
-    # ROLE FILTERS
-    # ---------------------------------------------------------
-    if user_role == "owner":
-        pass  # Owner sees everything
-
-    elif user_role in [
-        "handloom_factory",
-        "powerloom_factory",
-        "outside_handloom",
-        "outside_powerloom"
-    ]:
-        base_q = base_q.filter(Loom.user_id == current_user.id)
-
-    else:
-        # Weaver sees only his looms
-        base_q = base_q.filter(Loom.user_id == current_user.id)
-
-    # ---------------------------------------------------------
-    # CATEGORY FILTER FUNCTION
-    # ---------------------------------------------------------
-    def q(loom_type):
-        return base_q.filter(Loom.loom_type == loom_type)
-
-    # ---------------------------------------------------------
-    # ROLE-BASED CATEGORY ASSIGNMENT
-    # ---------------------------------------------------------
-    if user_role == "owner":
-        handloom_q = q("Handloom")
-        powerloom_q = q("Powerloom")
-        outside_handloom_q = q("OutsideHandloom")
-        outside_powerloom_q = q("OutsidePowerloom")
-
-    elif user_role == "handloom_factory":
-        handloom_q = q("Handloom")
-        powerloom_q = outside_handloom_q = outside_powerloom_q = base_q.filter(False)
-
-    elif user_role == "powerloom_factory":
-        powerloom_q = q("Powerloom")
-        handloom_q = outside_handloom_q = outside_powerloom_q = base_q.filter(False)
-
-    elif user_role == "outside_handloom":
-        outside_handloom_q = q("OutsideHandloom")
-        handloom_q = powerloom_q = outside_powerloom_q = base_q.filter(False)
-
-    elif user_role == "outside_powerloom":
-        outside_powerloom_q = q("OutsidePowerloom")
-        handloom_q = powerloom_q = outside_handloom_q = base_q.filter(False)
-
-    else:
+    # Loom.loom_type → category, limited to what this role may see
+    visible_types = visible_loom_types(user_role)
+    if not visible_types:
         flash("Invalid role. Contact admin.", "danger")
         return redirect(url_for("auth.dashboard"))
 
+    base_q = payments_on_day_query(selected_date, visible_types, current_user)
+
     # -------------------------------------------------------------
-    # FETCH PAYMENT LISTS
+    # FETCH PAYMENTS ONCE, PARTITION BY LOOM TYPE
     # -------------------------------------------------------------
-    handloom_payments = handloom_q.order_by(Payment.id.desc()).all()
-    powerloom_payments = powerloom_q.order_by(Payment.id.desc()).all()
-    outside_handloom_payments = outside_handloom_q.order_by(Payment.id.desc()).all()
-    outside_powerloom_payments = outside_powerloom_q.order_by(Payment.id.desc()).all()
+    rows = (
+        base_q.options(contains_eager(Payment.weaver))
+        .order_by(Payment.id.desc())
+        .all()
+    )
+
+    payments = {category: [] for category in PAYMENT_CATEGORIES}
+    for payment, loom_type in rows:
+        payments[visible_types[loom_type]].append(payment)
 
     # -------------------------------------------------------------
-    # TOTALS
+    # TOTALS (one aggregate row: per category + grand total)
     # -------------------------------------------------------------
-    def total(rows):
-        return float(sum((p.amount or 0) for p in rows))
+    total_columns = [
+        func.sum(case((Loom.loom_type == loom_type, Payment.amount), else_=0)).label(category)
+        for category, loom_type in PAYMENT_CATEGORIES.items()
+    ]
+    total_columns.append(func.sum(Payment.amount).label("grand_total"))
 
     totals = {
-        "handloom": total(handloom_payments),
-        "powerloom": total(powerloom_payments),
-        "outside_handloom": total(outside_handloom_payments),
-        "outside_powerloom": total(outside_powerloom_payments),
-        "grand_total": total(
-            handloom_payments +
-            powerloom_payments +
-            outside_handloom_payments +
-            outside_powerloom_payments
-        )
+        key: float(value or 0)
+        for key, value in base_q.with_entities(*total_columns).one()._mapping.items()
     }
 
     return render_template(
         "payments/payments_view_by_date.html",
         date=selected_date,
-        handloom_payments=handloom_payments,
-        powerloom_payments=powerloom_payments,
-        outside_handloom_payments=outside_handloom_payments,
-        outside_powerloom_payments=outside_powerloom_payments,
+        handloom_payments=payments["handloom"],
+        powerloom_payments=payments["powerloom"],
+        outside_handloom_payments=payments["outside_handloom"],
+        outside_powerloom_payments=payments["outside_powerloom"],
         totals=totals,
         user_role=user_role
     )
@@ -140,27 +170,14 @@ def payments_by_date(date_str):
 @login_required
 def list_payment_dates():
 
-    user_role = role()
-
-    if user_role == "owner":
-        dates = (
-            db.session.query(cast(Payment.date, Date).label("d"))   # <-- FIXED
-            .distinct()
-            .order_by(cast(Payment.date, Date).desc())
-            .all()
-        )
-
-    else:
-        dates = (
-            db.session.query(cast(Payment.date, Date).label("d"))   # <-- FIXED
-            .join(Loom, Payment.loom_id == Loom.id)
-            .filter(Loom.user_id == current_user.id)
-            .distinct()
-            .order_by(cast(Payment.date, Date).desc())
-            .all()
-        )
+    visible_types = visible_loom_types(role())
+    if not visible_types:
+        flash("Invalid role. Contact admin.", "danger")
+        return redirect(url_for("auth.dashboard"))
 
-    payment_dates = [d.d for d in dates]  # pick the labeled column
+    # Read from the maintained daily summary instead of scanning payments,
+    # scoped like payments_by_date so a day's count and total match it
+    payment_dates = payment_dates_query(visible_types, current_user).all()
 
     return render_template(
         "payments/payment_dates.html",
@@ -1,11 +1,14 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
-from werkzeug.utils import secure_filename
-import os
 import traceback
 
 from models.weaver import Weaver
 from app import db
+from utils.cache import invalidate_aggregates
+from utils.uploads import store_upload, release_uploads
+from services.import_service import (
+    iter_upload_rows, import_weavers, ImportFileError, WEAVER_IMPORT_FIELDS
+)
 
 weaver_bp = Blueprint('weaver', __name__, url_prefix='/weaver')
 
@@ -76,16 +79,7 @@ def create_weaver():
             file = request.files.get('aadharcard')
 
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                unique = os.urandom(8).hex()
-                filename = f"{unique}_{filename}"
-
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                os.makedirs(upload_folder, exist_ok=True)
-
-                file_path = os.path.join(upload_folder, filename)
-                file.save(file_path)
-                aadharcard_filename = filename
+                aadharcard_filename = store_upload(file, current_app.config['UPLOAD_FOLDER'])
 
             new_weaver = Weaver(
                 weavername=weavername,
@@ -102,6 +96,7 @@ def create_weaver():
 
             db.session.add(new_weaver)
             db.session.commit()
+            invalidate_aggregates(current_user.id)
 
             flash('Weaver created successfully!', 'success')
             return redirect(url_for('weaver.list_weavers'))
@@ -115,6 +110,57 @@ def create_weaver():
     return render_template('create_weaver.html')
 
 
+# -------------------------------------------------
+# IMPORT WEAVERS (CSV / EXCEL)
+# -------------------------------------------------
+IMPORT_ERRORS_SHOWN = 100
+
+
+@weaver_bp.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_weavers_file():
+    """Create / update weavers from a spreadsheet, matched on phone number."""
+    page = dict(
+        title="Import Weavers",
+        fields=WEAVER_IMPORT_FIELDS,
+        required=("weavername", "phonenumber"),
+        note="A phone number you already have updates that weaver; blank cells keep the current value.",
+        back_url=url_for('weaver.list_weavers')
+    )
+
+    if request.method == 'GET':
+        return render_template('import_records.html', **page)
+
+    file = request.files.get('import_file')
+    if not file or not file.filename:
+        flash('Please choose a CSV or Excel file.', 'danger')
+        return redirect(url_for('weaver.import_weavers_file'))
+
+    try:
+        result = import_weavers(iter_upload_rows(file), current_user.id)
+
+    except ImportFileError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('weaver.import_weavers_file'))
+
+    except Exception as e:
+        db.session.rollback()
+        print("🔥 import_weavers ERROR:", e)
+        traceback.print_exc()
+        flash('Error occurred while importing weavers.', 'danger')
+        return redirect(url_for('weaver.import_weavers_file'))
+
+    if result["inserted"] or result["updated"]:
+        invalidate_aggregates(current_user.id)
+
+    return render_template(
+        'import_records.html',
+        result=result,
+        errors=result["errors"][:IMPORT_ERRORS_SHOWN],
+        **page
+    )
+
+
 # -------------------------------------------------
 # VIEW WEAVER
 # -------------------------------------------------
@@ -153,27 +199,16 @@ def edit_weaver(id):
             weaver.name_in_bank = request.form.get('name_in_bank')
 
             # Aadhaar Upload
+            replaced_file = None
             file = request.files.get('aadharcard')
             if file and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                unique = os.urandom(8).hex()
-                filename = f"{unique}_{filename}"
-
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                os.makedirs(upload_folder, exist_ok=True)
-
-                file_path = os.path.join(upload_folder, filename)
-                file.save(file_path)
-
-                # Remove previous file
-                if weaver.aadharcard:
-                    old = os.path.join(upload_folder, weaver.aadharcard)
-                    if os.path.exists(old):
-                        os.remove(old)
-
-                weaver.aadharcard = filename
+                replaced_file = weaver.aadharcard
+                weaver.aadharcard = store_upload(file, current_app.config['UPLOAD_FOLDER'])
 
             db.session.commit()
+
+            # Remove previous file unless another row still uses it
+            release_uploads(current_app.config['UPLOAD_FOLDER'], replaced_file)
             flash('Weaver updated successfully!', 'success')
             return redirect(url_for('weaver.view_weaver', id=weaver.id))
 
@@ -218,13 +253,12 @@ def delete_weaver(id):
     weaver = get_weaver_or_404(id)
 
     try:
-        if weaver.aadharcard:
-            file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], weaver.aadharcard)
-            if os.path.exists(file_path):
-                os.remove(file_path)
-
         db.session.delete(weaver)
         db.session.commit()
+        invalidate_aggregates(weaver.user_id)
+
+        # Shared (deduplicated) files are only removed with their last reference
+        release_uploads(current_app.config['UPLOAD_FOLDER'], weaver.aadharcard)
 
         flash("Weaver deleted successfully!", "success")
 
@@ -0,0 +1,41 @@
+"""add saree counters to looms
+
+Revision ID: 3c1d9e5a7b42
+Revises: 87fd4a756ce8
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d9e5a7b42'
+down_revision = '87fd4a756ce8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sarees_added', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_saree_number', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing saree entries
+    op.execute("""
+        UPDATE looms SET
+            sarees_added = (
+                SELECT COUNT(*) FROM saree_entries
+                WHERE saree_entries.loom_id = looms.id
+            ),
+            last_saree_number = (
+                SELECT COALESCE(MAX(saree_number), 0) FROM saree_entries
+                WHERE saree_entries.loom_id = looms.id
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.drop_column('last_saree_number')
+        batch_op.drop_column('sarees_added')
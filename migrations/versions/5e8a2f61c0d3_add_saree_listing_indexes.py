@@ -0,0 +1,34 @@
+"""add composite indexes for saree listing and loom views
+
+Revision ID: 5e8a2f61c0d3
+Revises: 3c1d9e5a7b42
+Create Date: 2026-10-18 10:02:17.441390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a2f61c0d3'
+down_revision = '3c1d9e5a7b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.create_index('ix_looms_loom_type_id', ['loom_type', 'id'], unique=False)
+
+    with op.batch_alter_table('saree_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_saree_entries_loom_id_saree_number', ['loom_id', 'saree_number'], unique=False)
+        batch_op.create_index('ix_saree_entries_loom_id_date', ['loom_id', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('saree_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_saree_entries_loom_id_date')
+        batch_op.drop_index('ix_saree_entries_loom_id_saree_number')
+
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.drop_index('ix_looms_loom_type_id')
@@ -0,0 +1,26 @@
+"""add (date, loom_id) index to payments
+
+Revision ID: 7b4f0c9d2e15
+Revises: 5e8a2f61c0d3
+Create Date: 2026-10-18 10:41:03.906527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4f0c9d2e15'
+down_revision = '5e8a2f61c0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_date_loom_id', ['date', 'loom_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_date_loom_id')
@@ -0,0 +1,45 @@
+"""add payment_daily_summary table
+
+Revision ID: 9a6e3d1f4b27
+Revises: 7b4f0c9d2e15
+Create Date: 2026-10-18 11:20:56.310472
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a6e3d1f4b27'
+down_revision = '7b4f0c9d2e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payment_daily_summary',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('loom_type', sa.String(length=50), nullable=False),
+    sa.Column('payment_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('date', 'user_id', 'loom_type')
+    )
+    with op.batch_alter_table('payment_daily_summary', schema=None) as batch_op:
+        batch_op.create_index('ix_payment_daily_summary_user_id_date', ['user_id', 'date'], unique=False)
+
+    # Backfill from existing payments
+    op.execute("""
+        INSERT INTO payment_daily_summary (date, user_id, loom_type, payment_count, total_amount)
+        SELECT payments.date, looms.user_id, looms.loom_type, COUNT(payments.id), COALESCE(SUM(payments.amount), 0)
+        FROM payments JOIN looms ON payments.loom_id = looms.id
+        GROUP BY payments.date, looms.user_id, looms.loom_type
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('payment_daily_summary', schema=None) as batch_op:
+        batch_op.drop_index('ix_payment_daily_summary_user_id_date')
+
+    op.drop_table('payment_daily_summary')
@@ -0,0 +1,28 @@
+"""add saree image variants
+
+Revision ID: c4d2a8e61f39
+Revises: 9a6e3d1f4b27
+Create Date: 2026-10-18 14:27:03.541872
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d2a8e61f39'
+down_revision = '9a6e3d1f4b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('saree_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('saree_thumb', sa.String(length=200), nullable=True))
+        batch_op.add_column(sa.Column('saree_medium', sa.String(length=200), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('saree_entries', schema=None) as batch_op:
+        batch_op.drop_column('saree_medium')
+        batch_op.drop_column('saree_thumb')
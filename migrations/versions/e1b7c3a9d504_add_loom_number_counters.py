@@ -0,0 +1,66 @@
+"""add loom number counters
+
+Revision ID: e1b7c3a9d504
+Revises: c4d2a8e61f39
+Create Date: 2026-10-18 15:02:44.903317
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1b7c3a9d504'
+down_revision = 'c4d2a8e61f39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Numbers handed out twice by the old MAX(loom_no) + 1 allocation would
+    # break the unique constraint below. Which loom keeps its number is a
+    # business decision, so stop here and list them instead of renumbering.
+    # (Offline --sql runs have no rows to look at.)
+    duplicates = [] if context.is_offline_mode() else op.get_bind().execute(sa.text("""
+        SELECT l.loom_type, l.loom_no, l.id, l.user_id, l.weaver_id, l.created_at
+        FROM looms l
+        JOIN (
+            SELECT loom_type, loom_no FROM looms
+            GROUP BY loom_type, loom_no
+            HAVING COUNT(*) > 1
+        ) d ON d.loom_type = l.loom_type AND d.loom_no = l.loom_no
+        ORDER BY l.loom_type, l.loom_no, l.id
+    """)).all()
+
+    if duplicates:
+        report = "\n".join(
+            f"  {loom_type} #{loom_no}: loom id={loom_id} user_id={user_id} "
+            f"weaver_id={weaver_id} created_at={created_at}"
+            for loom_type, loom_no, loom_id, user_id, weaver_id, created_at in duplicates
+        )
+        raise RuntimeError(
+            "looms has duplicate (loom_type, loom_no) pairs; give each loom below a "
+            "unique number (UPDATE looms SET loom_no = ... WHERE id = ...) and rerun "
+            f"the upgrade:\n{report}"
+        )
+
+    op.create_table('loom_number_counters',
+    sa.Column('loom_type', sa.String(length=50), nullable=False),
+    sa.Column('last_loom_no', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('loom_type')
+    )
+
+    op.execute("""
+        INSERT INTO loom_number_counters (loom_type, last_loom_no)
+        SELECT loom_type, MAX(loom_no) FROM looms GROUP BY loom_type
+    """)
+
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_looms_loom_type_loom_no', ['loom_type', 'loom_no'])
+
+
+def downgrade():
+    with op.batch_alter_table('looms', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_looms_loom_type_loom_no', type_='unique')
+
+    op.drop_table('loom_number_counters')
@@ -1,5 +1,5 @@
 # app/models/__init__.py
 from .user import User
-from .loom import Loom
+from .loom import Loom, LoomNumberCounter
 from .weaver import Weaver
-from .payments import Payment
\ No newline at end of file
+from .payments import Payment, PaymentDailySummary
\ No newline at end of file
@@ -1,12 +1,20 @@
 from app import db
 from datetime import datetime, date
 import webcolors
+from functools import lru_cache
+from sqlalchemy import event
 
 # --------------------------------------------------------
 # LOOM MODEL
 # --------------------------------------------------------
 class Loom(db.Model):
     __tablename__ = 'looms'
+    __table_args__ = (
+        # saree listings: looms of a type → their sarees
+        db.Index('ix_looms_loom_type_id', 'loom_type', 'id'),
+        # loom numbers are allocated per type (LoomNumberCounter)
+        db.UniqueConstraint('loom_type', 'loom_no', name='uq_looms_loom_type_loom_no'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     loom_no = db.Column(db.Integer, nullable=False)
@@ -44,6 +52,10 @@ class Loom(db.Model):
     # Loom info
     loom_type = db.Column(db.String(50), nullable=False)
     num_sarees = db.Column(db.Integer, nullable=False, default=0)
+
+    # Saree counters (kept in step with saree_entries on insert/delete)
+    sarees_added = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    last_saree_number = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     saree_type = db.Column(db.String(50), nullable=True)
     saree_name = db.Column(db.String(100), nullable=True)
 
@@ -65,24 +77,189 @@ class Loom(db.Model):
     @property
     def remaining_sarees(self):
         try:
-            return max(self.num_sarees - len(self.saree_entries), 0)
+            return max(self.num_sarees - (self.sarees_added or 0), 0)
         except Exception:
             return 0
 
+    @staticmethod
+    def reserve_saree_numbers(loom_id, count=1):
+        """
+        Reserve count consecutive saree numbers on a loom and bump its
+        counters in one UPDATE, unless that would pass num_sarees (0 = no
+        limit). Returns the first number, or None when the limit is reached.
+        The row stays locked until commit: commit with the new sarees.
+        """
+        stmt = (
+            db.update(Loom)
+            .where(Loom.id == loom_id)
+            .where(db.or_(
+                Loom.num_sarees.is_(None),
+                Loom.num_sarees == 0,
+                Loom.sarees_added + count <= Loom.num_sarees
+            ))
+            .values(
+                last_saree_number=Loom.last_saree_number + count,
+                sarees_added=Loom.sarees_added + count
+            )
+            .returning(Loom.last_saree_number)
+        )
+
+        last = db.session.execute(stmt).scalar_one_or_none()
+        return None if last is None else last - count + 1
+
+    @staticmethod
+    def repair_saree_counters(loom_id=None):
+        """Recompute sarees_added / last_saree_number from saree_entries."""
+        added = (
+            db.select(db.func.count(SareeEntry.id))
+            .where(SareeEntry.loom_id == Loom.id)
+            .scalar_subquery()
+        )
+        last_number = (
+            db.select(db.func.coalesce(db.func.max(SareeEntry.saree_number), 0))
+            .where(SareeEntry.loom_id == Loom.id)
+            .scalar_subquery()
+        )
+
+        stmt = db.update(Loom).values(sarees_added=added, last_saree_number=last_number)
+        if loom_id is not None:
+            stmt = stmt.where(Loom.id == loom_id)
+
+        return db.session.execute(stmt).rowcount
+
     def __repr__(self):
         return f"<Loom No: {self.loom_no} ({self.loom_type})>"
 
 
+# --------------------------------------------------------
+# LOOM NUMBER COUNTERS (one row per loom type)
+# --------------------------------------------------------
+class LoomNumberCounter(db.Model):
+    __tablename__ = 'loom_number_counters'
+
+    loom_type = db.Column(db.String(50), primary_key=True)
+    last_loom_no = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def _insert():
+        if db.session.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert
+
+    @staticmethod
+    def allocate(loom_type, count=1):
+        """
+        Next loom number for loom_type, in the current transaction (with
+        count > 1, the first of `count` consecutive numbers). The upsert
+        increments and locks the counter row in one statement, so
+        concurrent creates (any worker process) wait on that row until
+        commit instead of reading the same MAX(loom_no). A rolled back
+        create also rolls back its number.
+        """
+        insert = LoomNumberCounter._insert()
+
+        table = LoomNumberCounter.__table__
+        stmt = insert(table).values(loom_type=loom_type, last_loom_no=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.loom_type],
+            set_={"last_loom_no": table.c.last_loom_no + count}
+        ).returning(table.c.last_loom_no)
+
+        return db.session.execute(stmt).scalar_one() - count + 1
+
+    @staticmethod
+    def raise_to(loom_type, loom_no):
+        """Make sure later allocations for loom_type start above loom_no (imported numbers)."""
+        insert = LoomNumberCounter._insert()
+
+        table = LoomNumberCounter.__table__
+        stmt = insert(table).values(loom_type=loom_type, last_loom_no=loom_no)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.loom_type],
+            set_={"last_loom_no": db.case(
+                (table.c.last_loom_no < loom_no, loom_no),
+                else_=table.c.last_loom_no
+            )}
+        )
+
+        db.session.execute(stmt)
+
+    def __repr__(self):
+        return f"<LoomNumberCounter {self.loom_type}: {self.last_loom_no}>"
+
+
+# --------------------------------------------------------
+# COLOR NAME LOOKUP (palette parsed once, results memoized)
+# --------------------------------------------------------
+# (r, g, b, name) for every CSS3 color, in a fixed order so ties are stable
+CSS3_PALETTE = tuple(
+    (*webcolors.hex_to_rgb(hex_val), name)
+    for hex_val, name in sorted(webcolors.CSS3_HEX_TO_NAMES.items())
+)
+
+
+@lru_cache(maxsize=4096)
+def closest_color_name(rgb):
+    r, g, b = rgb
+    return min(
+        CSS3_PALETTE,
+        key=lambda c: (c[0] - r) ** 2 + (c[1] - g) ** 2 + (c[2] - b) ** 2
+    )[3]
+
+
+@lru_cache(maxsize=4096)
+def resolve_display_color(colors):
+    if not colors:
+        return None
+
+    color_str = colors.strip()
+
+    if color_str.upper().endswith("M"):
+        return color_str.upper()
+
+    if not any(c in color_str for c in [",", "#"]):
+        return color_str.capitalize()
+
+    if color_str.startswith("#"):
+        try:
+            return webcolors.hex_to_name(color_str)
+        except ValueError:
+            try:
+                return closest_color_name(tuple(webcolors.hex_to_rgb(color_str)))
+            except ValueError:
+                return color_str
+
+    if "," in color_str:
+        try:
+            r, g, b = [int(x.strip()) for x in color_str.split(",")]
+            return closest_color_name((r, g, b))
+        except Exception:
+            return color_str
+
+    return color_str
+
+
 # --------------------------------------------------------
 # SAREE ENTRY MODEL
 # --------------------------------------------------------
 class SareeEntry(db.Model):
     __tablename__ = 'saree_entries'
+    __table_args__ = (
+        # view_loom / download: sarees of a loom ordered by number
+        db.Index('ix_saree_entries_loom_id_saree_number', 'loom_id', 'saree_number'),
+        # saree listings: sarees of a loom ordered / ranged by date
+        db.Index('ix_saree_entries_loom_id_date', 'loom_id', 'date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     saree_number = db.Column(db.Integer, nullable=True)
     saree_name = db.Column(db.String(100), nullable=True)
     saree_image = db.Column(db.String(200), nullable=True)
+    # Resized copies of saree_image (utils/images.py), relative to UPLOAD_FOLDER
+    saree_thumb = db.Column(db.String(200), nullable=True)
+    saree_medium = db.Column(db.String(200), nullable=True)
     colors = db.Column(db.String(200), nullable=True)
     warp_weft = db.Column(db.String(100), nullable=True)
     material = db.Column(db.String(100), nullable=True)
@@ -130,45 +307,22 @@ class SareeEntry(db.Model):
 
     @property
     def display_color(self):
-        if not self.colors:
-            return None
-
-        color_str = self.colors.strip()
-
-        if color_str.upper().endswith("M"):
-            return color_str.upper()
-
-        if not any(c in color_str for c in [",", "#"]):
-            return color_str.capitalize()
-
-        if color_str.startswith("#"):
-            try:
-                return webcolors.hex_to_name(color_str)
-            except ValueError:
-                rgb = webcolors.hex_to_rgb(color_str)
-                return self._closest_color_name(rgb)
-
-        if "," in color_str:
-            try:
-                r, g, b = [int(x.strip()) for x in color_str.split(",")]
-                return self._closest_color_name((r, g, b))
-            except Exception:
-                return color_str
-
-        return color_str
-
-    def _closest_color_name(self, rgb):
-        min_colors = {}
-        for hex_val, name in webcolors.CSS3_HEX_TO_NAMES.items():
-            r, g, b = webcolors.hex_to_rgb(hex_val)
-            dist = (r - rgb[0])**2 + (g - rgb[1])**2 + (b - rgb[2])**2
-            min_colors[dist] = name
-        return min_colors[min(min_colors.keys())]
+        return resolve_display_color(self.colors)
 
     def __repr__(self):
         return f"<SareeEntry {self.saree_number}>"
 
 
+@event.listens_for(SareeEntry, "after_delete")
+def _decrement_loom_saree_count(mapper, connection, target):
+    # Runs inside the deleting flush, so the counter commits with the delete
+    connection.execute(
+        db.update(Loom)
+        .where(Loom.id == target.loom_id, Loom.sarees_added > 0)
+        .values(sarees_added=Loom.sarees_added - 1)
+    )
+
+
 # --------------------------------------------------------
 # WARP MODEL
 # --------------------------------------------------------
@@ -0,0 +1,9 @@
+# --------------------------------------------------------
+# LOOM TYPES (values stored in Loom.loom_type)
+# --------------------------------------------------------
+HANDLOOM = "Handloom"
+POWERLOOM = "Powerloom"
+OUTSIDE_HANDLOOM = "Outsideloom"
+OUTSIDE_POWERLOOM = "OutsidePowerloom"
+
+LOOM_TYPES = (HANDLOOM, POWERLOOM, OUTSIDE_HANDLOOM, OUTSIDE_POWERLOOM)
@@ -1,8 +1,13 @@
 from app import db
 from datetime import date
+from sqlalchemy import event
 
 class Payment(db.Model):
     __tablename__ = "payments"
+    __table_args__ = (
+        # payment day views / payment-dates index: range scans on date
+        db.Index("ix_payments_date_loom_id", "date", "loom_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -46,4 +51,105 @@ class Payment(db.Model):
     )
 
     def __repr__(self):
-        return f"<Payment {self.id} {self.amount}>"
\ No newline at end of file
+        return f"<Payment {self.id} {self.amount}>"
+
+
+# --------------------------------------------------------
+# PAYMENT DAILY SUMMARY (maintained on payment insert/delete)
+# --------------------------------------------------------
+class PaymentDailySummary(db.Model):
+    __tablename__ = "payment_daily_summary"
+    __table_args__ = (
+        db.Index("ix_payment_daily_summary_user_id_date", "user_id", "date"),
+    )
+
+    date = db.Column(db.Date, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    loom_type = db.Column(db.String(50), primary_key=True)
+
+    payment_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Float, nullable=False, default=0.0)
+
+    @staticmethod
+    def rebuild():
+        """Recompute the whole summary from payments (run inside a transaction)."""
+        from models.loom import Loom
+
+        db.session.execute(db.delete(PaymentDailySummary))
+
+        totals = (
+            db.select(
+                Payment.date,
+                Loom.user_id,
+                Loom.loom_type,
+                db.func.count(Payment.id),
+                db.func.coalesce(db.func.sum(Payment.amount), 0)
+            )
+            .join(Loom, Payment.loom_id == Loom.id)
+            .group_by(Payment.date, Loom.user_id, Loom.loom_type)
+        )
+
+        return db.session.execute(
+            db.insert(PaymentDailySummary).from_select(
+                ["date", "user_id", "loom_type", "payment_count", "total_amount"],
+                totals
+            )
+        ).rowcount
+
+    @staticmethod
+    def apply(connection, day, user_id, loom_type, count, amount):
+        """Add count / amount to one summary row (upsert). Negative values subtract."""
+        if connection.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = PaymentDailySummary.__table__
+        stmt = insert(table).values(
+            date=day,
+            user_id=user_id,
+            loom_type=loom_type,
+            payment_count=count,
+            total_amount=amount
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.date, table.c.user_id, table.c.loom_type],
+            set_={
+                "payment_count": table.c.payment_count + stmt.excluded.payment_count,
+                "total_amount": table.c.total_amount + stmt.excluded.total_amount,
+            }
+        )
+        connection.execute(stmt)
+
+    def __repr__(self):
+        return f"<PaymentDailySummary {self.date} {self.loom_type} x{self.payment_count}>"
+
+
+def _apply_to_summary(connection, payment, sign):
+    # Payments without a loom have no user / loom type to file under
+    if not payment.loom_id:
+        return
+
+    from models.loom import Loom
+
+    loom = connection.execute(
+        db.select(Loom.user_id, Loom.loom_type).where(Loom.id == payment.loom_id)
+    ).first()
+    if loom is None:
+        return
+
+    PaymentDailySummary.apply(
+        connection, payment.date, loom.user_id, loom.loom_type,
+        sign, sign * float(payment.amount or 0)
+    )
+
+
+# Run inside the flush, so the summary commits with the payment itself
+@event.listens_for(Payment, "after_insert")
+def _summary_after_insert(mapper, connection, target):
+    _apply_to_summary(connection, target, 1)
+
+
+@event.listens_for(Payment, "after_delete")
+def _summary_after_delete(mapper, connection, target):
+    _apply_to_summary(connection, target, -1)
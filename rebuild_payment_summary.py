@@ -0,0 +1,21 @@
+from app import create_app, db
+
+
+def rebuild_payment_summary():
+    """Recompute payment_daily_summary from the payments table"""
+    app = create_app()
+
+    with app.app_context():
+        from models.payments import PaymentDailySummary
+
+        try:
+            rows = PaymentDailySummary.rebuild()
+            db.session.commit()
+            print(f"Payment daily summary rebuilt ({rows} rows).")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"Payment summary rebuild failed: {str(e)}")
+
+if __name__ == '__main__':
+    rebuild_payment_summary()
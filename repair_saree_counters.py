@@ -0,0 +1,22 @@
+import sys
+from app import create_app, db
+
+
+def repair_saree_counters(loom_id=None):
+    """Recompute Loom.sarees_added / last_saree_number from saree_entries"""
+    app = create_app()
+
+    with app.app_context():
+        from models.loom import Loom
+
+        try:
+            updated = Loom.repair_saree_counters(loom_id)
+            db.session.commit()
+            print(f"Saree counters repaired for {updated} loom(s).")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"Saree counter repair failed: {str(e)}")
+
+if __name__ == '__main__':
+    repair_saree_counters(int(sys.argv[1]) if len(sys.argv) > 1 else None)
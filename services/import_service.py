@@ -0,0 +1,411 @@
+import os
+from itertools import islice
+from sqlalchemy import insert, update, select, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from models.loom import Loom, LoomNumberCounter
+from models.loom_types import LOOM_TYPES as STORED_LOOM_TYPES
+from models.weaver import Weaver
+from utils.csv_stream import iter_csv_upload
+
+# Rows validated, looked up and written together
+IMPORT_BATCH_SIZE = 500
+
+# Upper bound per upload
+IMPORT_MAX_ROWS = 20000
+
+WEAVER_IMPORT_FIELDS = (
+    "weavername", "phonenumber", "address", "skills",
+    "account_number", "ifsc_code", "account_type", "name_in_bank",
+)
+WEAVER_IMPORT_ALIASES = {
+    "weaver_name": "weavername",
+    "name": "weavername",
+    "phone": "phonenumber",
+    "phone_number": "phonenumber",
+}
+
+LOOM_IMPORT_FIELDS = ("loom_type", "loom_no", "num_sarees", "weaver_phone", "saree_type", "saree_name")
+LOOM_IMPORT_ALIASES = {
+    "type": "loom_type",
+    "loom_number": "loom_no",
+    "phone": "weaver_phone",
+    "phonenumber": "weaver_phone",
+}
+
+# Accepted spellings (lower-case, no separators) → stored loom_type
+LOOM_TYPES = {loom_type.lower(): loom_type for loom_type in STORED_LOOM_TYPES}
+
+
+class ImportFileError(Exception):
+    """The upload can't be read as a CSV / Excel sheet."""
+
+
+# ==========================================================
+#   READING UPLOADS
+# ==========================================================
+def iter_upload_rows(file):
+    """
+    (row number, row dict) for each data row of an uploaded .csv or .xlsx,
+    read as it is parsed. Raises ImportFileError for other files.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower().lstrip(".")
+
+    if ext == "csv":
+        return iter_csv_upload(file)
+    if ext == "xlsx":
+        return _iter_xlsx_upload(file)
+
+    raise ImportFileError("Upload a .csv or .xlsx file.")
+
+
+def _iter_xlsx_upload(file):
+    """First worksheet of an .xlsx, header row first; read_only mode streams the sheet XML."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Excel import needs openpyxl; upload a CSV instead.")
+
+    try:
+        workbook = load_workbook(file.stream, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f"Not a readable .xlsx file: {e}")
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+
+        header = ["" if cell is None else str(cell) for cell in header]
+        for row_no, cells in enumerate(rows, start=2):
+            if all(cell in (None, "") for cell in cells):
+                continue
+            yield row_no, dict(zip(header, cells))
+    finally:
+        workbook.close()
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _normalize_row(raw, fields, aliases):
+    """Row keyed by import field names (header case / spaces ignored). Returns (row, errors)."""
+    row = {}
+    for key, value in raw.items():
+        if not key:
+            continue
+        key = str(key).strip().lower().replace(" ", "_")
+        key = aliases.get(key, key)
+
+        if isinstance(value, float) and value.is_integer():
+            # Excel stores phone / loom numbers as floats
+            value = int(value)
+        value = None if value is None else str(value).strip()
+        row[key] = value or None
+
+    unknown = sorted(set(row) - set(fields))
+    errors = [f"unknown column(s): {', '.join(unknown)}"] if unknown else []
+    return row, errors
+
+
+def _check_length(table, field, value, errors):
+    limit = table.c[field].type.length
+    if value and limit and len(value) > limit:
+        errors.append(f"{field}: longer than {limit} characters")
+
+
+def _parse_int(field, value, errors, required=False, minimum=0):
+    if value is None:
+        if required:
+            errors.append(f"{field} is required")
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        errors.append(f"{field}: not a whole number: {value!r}")
+        return None
+    if number < minimum:
+        errors.append(f"{field}: must be at least {minimum}")
+        return None
+    return number
+
+
+def _write_batch(model, inserts, updates, result, prepare=None):
+    """
+    Write one batch: inserts / updates are [(row number, column values)].
+    Normally one multi-row INSERT, one executemany UPDATE and a commit. If
+    that hits an IntegrityError (a row written concurrently since the
+    batch was checked), the batch is redone one row per savepoint so only
+    the conflicting rows are reported. prepare(values_list) runs before
+    inserting, in the same transaction / savepoint.
+    """
+    try:
+        if inserts:
+            if prepare:
+                prepare([values for _, values in inserts])
+            db.session.execute(insert(model), [values for _, values in inserts])
+        if updates:
+            db.session.execute(update(model), [values for _, values in updates])
+        db.session.commit()
+
+        result["inserted"] += len(inserts)
+        result["updated"] += len(updates)
+        return
+
+    except IntegrityError:
+        db.session.rollback()
+
+    for key, rows, statement in (("inserted", inserts, insert(model)), ("updated", updates, update(model))):
+        for row_no, values in rows:
+            try:
+                with db.session.begin_nested():
+                    if prepare and key == "inserted":
+                        prepare([values])
+                    db.session.execute(statement, [values])
+
+            except IntegrityError as e:
+                result["errors"].append({"row": row_no, "error": f"not imported: {e.orig}"})
+                continue
+
+            result[key] += 1
+
+    db.session.commit()
+
+
+# ==========================================================
+#   WEAVERS
+# ==========================================================
+def parse_weaver_row(raw):
+    """Weaver column values for one import row. Returns (values, errors)."""
+    values, errors = _normalize_row(raw, WEAVER_IMPORT_FIELDS, WEAVER_IMPORT_ALIASES)
+
+    for field in ("weavername", "phonenumber"):
+        if not values.get(field):
+            errors.append(f"{field} is required")
+
+    for field in WEAVER_IMPORT_FIELDS:
+        _check_length(Weaver.__table__, field, values.get(field), errors)
+
+    return values, errors
+
+
+def import_weavers(raw_rows, user_id):
+    """
+    Upsert weavers for user_id, keyed by phone number: a phone the user
+    already has updates that weaver (blank cells keep their value), a new
+    one inserts it. Rows go through in batches of IMPORT_BATCH_SIZE: one
+    SELECT for the batch's phones, one multi-row INSERT, one executemany
+    UPDATE and a commit, so earlier batches stay imported if a later one
+    fails. Invalid rows are skipped and reported.
+
+    Returns {"inserted", "updated", "errors": [{"row", "error"}]}.
+    """
+    result = {"inserted": 0, "updated": 0, "errors": []}
+    seen = {}
+    total = 0
+
+    for batch in _batches(islice(raw_rows, IMPORT_MAX_ROWS + 1), IMPORT_BATCH_SIZE):
+        valid = {}
+        for row_no, raw in batch:
+            total += 1
+            if total > IMPORT_MAX_ROWS:
+                result["errors"].append({"row": row_no, "error": f"more than {IMPORT_MAX_ROWS} rows in one upload"})
+                break
+
+            values, errors = parse_weaver_row(raw)
+            phone = values.get("phonenumber")
+            if phone in seen:
+                errors.append(f"phone number {phone} already on row {seen[phone]}")
+            if errors:
+                result["errors"].extend({"row": row_no, "error": e} for e in errors)
+                continue
+
+            seen[phone] = row_no
+            valid[phone] = (row_no, values)
+
+        if not valid:
+            continue
+
+        existing = dict(db.session.execute(
+            select(Weaver.phonenumber, Weaver.id)
+            .where(Weaver.user_id == user_id, Weaver.phonenumber.in_(list(valid)))
+        ).all())
+
+        inserts = []
+        updates = []
+        for phone, (row_no, values) in valid.items():
+            if phone in existing:
+                changes = {field: value for field, value in values.items() if value is not None}
+                updates.append((row_no, dict(changes, id=existing[phone])))
+            else:
+                inserts.append((row_no, dict(
+                    {field: values.get(field) for field in WEAVER_IMPORT_FIELDS},
+                    user_id=user_id,
+                    is_active=True
+                )))
+
+        _write_batch(Weaver, inserts, updates, result)
+
+    result["errors"].sort(key=lambda e: e["row"] or 0)
+    return result
+
+
+# ==========================================================
+#   LOOMS
+# ==========================================================
+def parse_loom_row(raw):
+    """Loom column values for one import row. Returns (values, errors)."""
+    values, errors = _normalize_row(raw, LOOM_IMPORT_FIELDS, LOOM_IMPORT_ALIASES)
+
+    loom_type = values.get("loom_type")
+    key = (loom_type or "").lower().replace(" ", "").replace("_", "").replace("-", "")
+    if not loom_type:
+        errors.append("loom_type is required")
+    elif key not in LOOM_TYPES:
+        errors.append(f"loom_type: expected one of {', '.join(LOOM_TYPES.values())}, got {loom_type!r}")
+    else:
+        values["loom_type"] = LOOM_TYPES[key]
+
+    values["loom_no"] = _parse_int("loom_no", values.get("loom_no"), errors, minimum=1)
+    values["num_sarees"] = _parse_int("num_sarees", values.get("num_sarees"), errors, required=True)
+
+    for field in ("saree_type", "saree_name"):
+        _check_length(Loom.__table__, field, values.get(field), errors)
+
+    return values, errors
+
+
+def _weavers_by_phone(phones, user_id, is_owner):
+    """phone → [weaver ids] among the weavers the importing user may assign."""
+    query = select(Weaver.phonenumber, Weaver.id).where(
+        Weaver.phonenumber.in_(phones),
+        Weaver.is_active.is_(True)
+    )
+    if not is_owner:
+        query = query.where(Weaver.user_id == user_id)
+
+    matches = {}
+    for phone, weaver_id in db.session.execute(query):
+        matches.setdefault(phone, []).append(weaver_id)
+    return matches
+
+
+def import_looms(raw_rows, user_id, is_owner=False):
+    """
+    Upsert looms, matching each row's weaver by phone number among the
+    weavers the user may see. A row with a loom_no that exists for its
+    loom_type updates that loom (num_sarees, weaver, saree type / name;
+    blank cells keep their value); any other row inserts a loom owned by
+    user_id, numbered loom_no or, when blank, from LoomNumberCounter (one
+    allocation per type and batch).
+    Batched like import_weavers: per batch one weaver lookup and one loom
+    lookup, then _write_batch.
+
+    Returns {"inserted", "updated", "errors": [{"row", "error"}]}.
+    """
+    result = {"inserted": 0, "updated": 0, "errors": []}
+    seen = {}
+    total = 0
+
+    for batch in _batches(islice(raw_rows, IMPORT_MAX_ROWS + 1), IMPORT_BATCH_SIZE):
+        parsed = []
+        for row_no, raw in batch:
+            total += 1
+            if total > IMPORT_MAX_ROWS:
+                result["errors"].append({"row": row_no, "error": f"more than {IMPORT_MAX_ROWS} rows in one upload"})
+                break
+
+            values, errors = parse_loom_row(raw)
+            number = (values.get("loom_type"), values.get("loom_no"))
+            if values.get("loom_no") and number in seen:
+                errors.append(f"{number[0]} loom {number[1]} already on row {seen[number]}")
+            if errors:
+                result["errors"].extend({"row": row_no, "error": e} for e in errors)
+                continue
+
+            if values.get("loom_no"):
+                seen[number] = row_no
+            parsed.append((row_no, values))
+
+        phones = {values["weaver_phone"] for _, values in parsed if values.get("weaver_phone")}
+        weavers = _weavers_by_phone(list(phones), user_id, is_owner) if phones else {}
+
+        numbers = [(values["loom_type"], values["loom_no"]) for _, values in parsed if values["loom_no"]]
+        existing = {}
+        if numbers:
+            for loom_id, loom_type, loom_no, owner_id, sarees_added in db.session.execute(
+                select(Loom.id, Loom.loom_type, Loom.loom_no, Loom.user_id, Loom.sarees_added)
+                .where(tuple_(Loom.loom_type, Loom.loom_no).in_(numbers))
+            ):
+                existing[(loom_type, loom_no)] = (loom_id, owner_id, sarees_added)
+
+        inserts = []
+        updates = []
+        for row_no, values in parsed:
+            weaver_id = None
+            phone = values.get("weaver_phone")
+            if phone:
+                ids = weavers.get(phone, [])
+                if len(ids) != 1:
+                    problem = "no active weaver" if not ids else f"{len(ids)} weavers"
+                    result["errors"].append({"row": row_no, "error": f"weaver_phone: {problem} with phone {phone}"})
+                    continue
+                weaver_id = ids[0]
+
+            loom = {
+                "num_sarees": values["num_sarees"],
+                "weaver_id": weaver_id,
+                "saree_type": values.get("saree_type"),
+                "saree_name": values.get("saree_name"),
+            }
+
+            match = existing.get((values["loom_type"], values["loom_no"]))
+            if match:
+                loom_id, owner_id, sarees_added = match
+                if not is_owner and owner_id != user_id:
+                    result["errors"].append({
+                        "row": row_no,
+                        "error": f"{values['loom_type']} loom {values['loom_no']} belongs to another user"
+                    })
+                    continue
+                if values["num_sarees"] and values["num_sarees"] < (sarees_added or 0):
+                    result["errors"].append({
+                        "row": row_no,
+                        "error": f"num_sarees: loom already has {sarees_added} sarees"
+                    })
+                    continue
+                changes = {field: value for field, value in loom.items() if value is not None}
+                updates.append((row_no, dict(changes, id=loom_id)))
+            else:
+                inserts.append((row_no, dict(loom, loom_type=values["loom_type"], loom_no=values["loom_no"], user_id=user_id)))
+
+        # Rows without a loom_no are numbered on each (re)try: numbers from a
+        # rolled back attempt are gone with it
+        auto_numbered = {id(values) for _, values in inserts if not values["loom_no"]}
+
+        def number_looms(looms):
+            # Explicit numbers move the counter past them; the rest get one range per type
+            unnumbered = {}
+            for loom in looms:
+                if id(loom) in auto_numbered:
+                    unnumbered.setdefault(loom["loom_type"], []).append(loom)
+                else:
+                    LoomNumberCounter.raise_to(loom["loom_type"], loom["loom_no"])
+
+            for loom_type, group in unnumbered.items():
+                first = LoomNumberCounter.allocate(loom_type, len(group))
+                for offset, loom in enumerate(group):
+                    loom["loom_no"] = first + offset
+
+        _write_batch(Loom, inserts, updates, result, prepare=number_looms)
+
+    result["errors"].sort(key=lambda e: e["row"] or 0)
+    return result
@@ -0,0 +1,205 @@
+from collections import defaultdict
+from datetime import datetime, date
+from sqlalchemy import insert
+
+from app import db
+from models.loom import Loom, SareeEntry
+from models.payments import Payment, PaymentDailySummary
+from utils.colors import resolve_saree_colors
+
+# Columns accepted by the bulk saree endpoint (JSON keys / CSV header)
+BULK_SAREE_TEXT_FIELDS = (
+    "saree_name", "border_color", "body_color",
+    "meena_a", "meena_b", "meena_c", "meena_d",
+    "warp_weft", "material",
+)
+BULK_SAREE_FIELDS = ("date", "completion_date") + BULK_SAREE_TEXT_FIELDS + ("amount_credit", "amount_debit")
+
+# Upper bound per request (looms without a num_sarees limit)
+BULK_SAREE_MAX_ROWS = 2000
+
+
+class SareeLimitReached(Exception):
+    """The loom already holds num_sarees sarees."""
+
+
+def build_auto_payment(loom, saree):
+    """
+    Debit Payment for a saree's amount_debit, snapshotting the bank details
+    of the loom's weaver (load loom.weaver with the loom). None when there
+    is nothing to pay.
+    """
+    amount = float(saree.amount_debit or 0)
+    if amount <= 0:
+        return None
+
+    return Payment(
+        date=saree.date,
+        amount=amount,
+        payment_type="debit",
+        loom_id=loom.id,
+        saree_entry=saree,
+        **_weaver_snapshot(loom.weaver)
+    )
+
+
+def _weaver_snapshot(weaver):
+    """weaver_id + bank details copied onto a payment (all None without a weaver)."""
+    return {
+        "weaver_id": weaver.id if weaver else None,
+        "name_in_bank": weaver.name_in_bank if weaver else None,
+        "account_number": weaver.account_number if weaver else None,
+        "ifsc_code": weaver.ifsc_code if weaver else None,
+        "account_type": weaver.account_type if weaver else None,
+    }
+
+
+def create_saree(loom, saree):
+    """
+    Number a new SareeEntry on loom and insert it with its auto payment in
+    one transaction (single flush, single commit). The saree number comes
+    from Loom.reserve_saree_numbers, so concurrent adds never share one or
+    pass num_sarees. Raises SareeLimitReached; the caller rolls back on
+    errors.
+    """
+    saree_number = Loom.reserve_saree_numbers(loom.id)
+    if saree_number is None:
+        raise SareeLimitReached(f"Loom {loom.loom_no} already has {loom.num_sarees} sarees")
+
+    saree.loom_id = loom.id
+    saree.saree_number = saree_number
+    db.session.add(saree)
+
+    payment = build_auto_payment(loom, saree)
+    if payment is not None:
+        db.session.add(payment)
+
+    db.session.commit()
+    return saree
+
+
+# ==========================================================
+#   BULK SAREE ENTRY
+# ==========================================================
+def parse_saree_row(raw):
+    """
+    Column values for one bulk saree row (dict keyed like BULK_SAREE_FIELDS;
+    header case / spaces are ignored). Returns (values, errors).
+    """
+    raw = {
+        str(key).strip().lower().replace(" ", "_"): value.strip() if isinstance(value, str) else value
+        for key, value in raw.items() if key
+    }
+    values = {}
+    errors = []
+
+    unknown = sorted(set(raw) - set(BULK_SAREE_FIELDS))
+    if unknown:
+        errors.append(f"unknown column(s): {', '.join(unknown)}")
+
+    for field in ("date", "completion_date"):
+        value = raw.get(field)
+        if value in (None, ""):
+            values[field] = date.today() if field == "date" else None
+            continue
+        try:
+            values[field] = datetime.strptime(str(value), "%Y-%m-%d").date()
+        except ValueError:
+            errors.append(f"{field}: expected YYYY-MM-DD, got {value!r}")
+
+    for field in ("amount_credit", "amount_debit"):
+        value = raw.get(field)
+        try:
+            values[field] = float(value or 0)
+        except (TypeError, ValueError):
+            errors.append(f"{field}: not a number: {value!r}")
+            continue
+        if values[field] < 0:
+            errors.append(f"{field}: must not be negative")
+
+    for field in BULK_SAREE_TEXT_FIELDS:
+        value = raw.get(field)
+        value = None if value in (None, "") else str(value)
+        limit = SareeEntry.__table__.c[field].type.length
+        if value and limit and len(value) > limit:
+            errors.append(f"{field}: longer than {limit} characters")
+        values[field] = value
+
+    resolve_saree_colors(values)
+    return values, errors
+
+
+def create_sarees_bulk(loom, raw_rows):
+    """
+    Insert many sarees on loom, with their auto payments, in one transaction.
+
+    raw_rows yields (row number, dict). Every row is validated first; any
+    error means nothing is inserted and the errors are returned as
+    [{"row": n, "error": msg}]. Otherwise num_sarees is checked once while
+    reserving one contiguous saree_number range, sarees and payments go in
+    as two executemany INSERTs, and the payment_daily_summary rows are
+    applied per day (bulk inserts skip the Payment listeners; the Loom
+    counters are bumped by the reservation). Load loom.weaver with the
+    loom. Returns (created, errors); raises SareeLimitReached.
+    """
+    rows = []
+    errors = []
+
+    for row_no, raw in raw_rows:
+        if len(rows) >= BULK_SAREE_MAX_ROWS:
+            errors.append({"row": row_no, "error": f"more than {BULK_SAREE_MAX_ROWS} rows in one upload"})
+            break
+
+        values, row_errors = parse_saree_row(raw)
+        errors.extend({"row": row_no, "error": e} for e in row_errors)
+        rows.append(values)
+
+    if not rows and not errors:
+        errors.append({"row": None, "error": "no saree rows"})
+    if errors:
+        return 0, errors
+
+    remaining = loom.remaining_sarees
+    first_number = Loom.reserve_saree_numbers(loom.id, len(rows))
+    if first_number is None:
+        raise SareeLimitReached(
+            f"Loom {loom.loom_no} has room for {remaining} more sarees, got {len(rows)}"
+        )
+
+    for offset, values in enumerate(rows):
+        values["loom_id"] = loom.id
+        values["saree_number"] = first_number + offset
+
+    saree_ids = db.session.scalars(
+        insert(SareeEntry).returning(SareeEntry.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+
+    snapshot = _weaver_snapshot(loom.weaver)
+    payments = [
+        dict(
+            date=values["date"],
+            amount=values["amount_debit"],
+            payment_type="debit",
+            loom_id=loom.id,
+            saree_id=saree_id,
+            **snapshot
+        )
+        for values, saree_id in zip(rows, saree_ids)
+        if values["amount_debit"] > 0
+    ]
+
+    if payments:
+        db.session.execute(insert(Payment), payments)
+
+        per_day = defaultdict(lambda: [0, 0.0])
+        for payment in payments:
+            per_day[payment["date"]][0] += 1
+            per_day[payment["date"]][1] += payment["amount"]
+
+        connection = db.session.connection()
+        for day, (count, amount) in per_day.items():
+            PaymentDailySummary.apply(connection, day, loom.user_id, loom.loom_type, count, amount)
+
+    db.session.commit()
+    return len(rows), []
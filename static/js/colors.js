@@ -0,0 +1,80 @@
+// Color palette: fills <select data-color-select> and [data-color-name] swatches
+// from the palette JSON (long-cached by the browser, fetched once per version).
+
+(function() {
+    const paletteUrl = document.currentScript.dataset.palette;
+
+    // Options rendered by the server (stored value, colors used on the loom)
+    // stay as they are; the palette adds everything else
+    function fillSelect(select, colors) {
+        const selected = select.value;
+        const present = new Set(Array.from(select.options, function(option) { return option.value; }));
+        const fragment = document.createDocumentFragment();
+
+        Array.from(select.options).forEach(function(option) {
+            if (option.value in colors) {
+                option.style.backgroundColor = colors[option.value];
+                option.style.color = "#000";
+            }
+        });
+
+        Object.entries(colors).forEach(function([name, hex]) {
+            if (present.has(name)) {
+                return;
+            }
+            const option = document.createElement("option");
+            option.value = name;
+            option.textContent = name;
+            option.style.backgroundColor = hex;
+            option.style.color = "#000";
+            fragment.appendChild(option);
+        });
+
+        select.appendChild(fragment);
+        select.value = selected;
+    }
+
+    // Without the palette, a free-text field keeps the form usable
+    function fallbackToText(select) {
+        const input = document.createElement("input");
+        input.type = "text";
+        input.name = select.name;
+        input.id = select.id;
+        input.className = select.className;
+        input.required = select.required;
+        input.value = select.value;
+        input.placeholder = select.options.length ? select.options[0].textContent : "";
+        select.replaceWith(input);
+    }
+
+    document.addEventListener("DOMContentLoaded", function() {
+        const selects = document.querySelectorAll("select[data-color-select]");
+        const swatches = document.querySelectorAll("[data-color-name]");
+
+        if (!selects.length && !swatches.length) {
+            return;
+        }
+
+        fetch(paletteUrl)
+            .then(function(res) {
+                if (!res.ok) {
+                    throw new Error("HTTP " + res.status);
+                }
+                return res.json();
+            })
+            .then(function(data) {
+                selects.forEach(function(select) { fillSelect(select, data.colors); });
+
+                swatches.forEach(function(el) {
+                    const hex = data.colors[el.dataset.colorName];
+                    if (hex) {
+                        el.style.background = hex;
+                    }
+                });
+            })
+            .catch(function(err) {
+                console.error("Palette load error:", err);
+                selects.forEach(fallbackToText);
+            });
+    });
+})();
@@ -0,0 +1,90 @@
+import atexit
+import threading
+import time
+import traceback
+from datetime import datetime
+from sqlalchemy import insert
+
+
+class ActivityLog:
+    """
+    Buffered writer for the Activity audit log. record() only appends to an
+    in-process buffer; a background thread writes it with one multi-row
+    INSERT once ACTIVITY_FLUSH_SIZE rows are waiting or every
+    ACTIVITY_FLUSH_INTERVAL seconds, and once more at process exit.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.flush_size = 50
+        self.flush_interval = 5
+        # Rows kept across failed flushes before the oldest are dropped
+        self.max_pending = 5000
+        self._rows = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+        self.flush_size = app.config["ACTIVITY_FLUSH_SIZE"]
+        self.flush_interval = app.config["ACTIVITY_FLUSH_INTERVAL"]
+        self.max_pending = self.flush_size * 100
+        atexit.register(self.flush)
+
+    def record(self, user_id, username, action):
+        """Queue an Activity row; the timestamp is taken now, not at flush time."""
+        with self._cond:
+            self._rows.append({
+                "user_id": user_id,
+                "username": username,
+                "action": action,
+                "timestamp": datetime.utcnow(),
+            })
+
+            # Started lazily so it also exists in forked worker processes
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-log", daemon=True)
+                self._thread.start()
+
+            if len(self._rows) >= self.flush_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._rows) >= self.flush_size, timeout=self.flush_interval)
+
+            if not self.flush():
+                # Database unavailable: don't spin on the re-queued rows
+                time.sleep(self.flush_interval)
+
+    def flush(self):
+        """Write every queued row now (also used before reading the log). False if it failed."""
+        with self._flush_lock:
+            with self._cond:
+                rows, self._rows = self._rows, []
+
+            if not rows:
+                return True
+
+            from app import db
+            from models.user import Activity
+
+            try:
+                with self.app.app_context():
+                    with db.engine.begin() as conn:
+                        conn.execute(insert(Activity), rows)
+                return True
+
+            except Exception as e:
+                print(f"🔥 activity log flush failed ({len(rows)} rows): {e}")
+                traceback.print_exc()
+
+                # Keep them for the next flush, bounded
+                with self._cond:
+                    self._rows = (rows + self._rows)[-self.max_pending:]
+                return False
+
+
+activity_log = ActivityLog()
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry TTL and LRU eviction.
+    Keys are (name, user_id, role) tuples so entries can be dropped per user.
+    """
+
+    def __init__(self, maxsize=512, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def configure(self, maxsize=None, ttl=None):
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl
+            self._data.clear()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, match=None):
+        """Drop every entry, or only the keys for which match(key) is true."""
+        with self._lock:
+            if match is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if match(k)]:
+                del self._data[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+# ==========================================================
+#   DASHBOARD / NOTIFICATION AGGREGATES
+# ==========================================================
+aggregate_cache = TTLCache()
+
+
+def cached_aggregate(name, user, loader):
+    """Per-user, per-role cached result of loader()."""
+    return aggregate_cache.get_or_load((name, user.id, user.role), loader)
+
+
+def invalidate_aggregates(user_id=None):
+    """
+    Call after a write to looms, sarees, weavers or payments. Drops the
+    entries of the owning user plus every owner entry (owners see all
+    rows); with no user_id the whole cache is cleared.
+    """
+    if user_id is None:
+        aggregate_cache.invalidate()
+        return
+
+    aggregate_cache.invalidate(lambda key: key[1] == user_id or key[2] == "owner")
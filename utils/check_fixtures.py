@@ -0,0 +1,53 @@
+import os
+from contextlib import contextmanager
+from app import db
+
+# Explicit loom numbers far above real ones, so the counters aren't used up
+LOOM_NO_BASE = 1_000_000_000
+
+
+def add_check_user(name, role):
+    """
+    Add (and flush) a throwaway user for a check_*.py script. The caller
+    commits it, or rolls it back together with the rest of its seed data.
+    """
+    from models.user import User
+
+    tag = os.urandom(4).hex()
+    user = User(
+        firstname=name,
+        lastname="check",
+        username=f"{name}check_{tag}",
+        email=f"{name}check_{tag}@example.invalid",
+        role=role
+    )
+    user.set_password(tag)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def delete_check_user(user_id):
+    """Delete a check user with the looms and weavers it created."""
+    from models.user import User
+    from models.loom import Loom
+    from models.weaver import Weaver
+
+    Loom.query.filter_by(user_id=user_id).delete()
+    Weaver.query.filter_by(user_id=user_id).delete()
+    User.query.filter_by(id=user_id).delete()
+    db.session.commit()
+
+
+@contextmanager
+def check_user(app, name, role):
+    """Committed throwaway user for the duration of a check; yields its id."""
+    with app.app_context():
+        user_id = add_check_user(name, role).id
+        db.session.commit()
+
+    try:
+        yield user_id
+    finally:
+        with app.app_context():
+            delete_check_user(user_id)
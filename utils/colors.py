@@ -0,0 +1,119 @@
+import os
+import json
+import hashlib
+import threading
+import webcolors
+from sqlalchemy import inspect
+
+# Versioned palette asset (color code → hex). Editing the file is enough to
+# roll out a new palette: it is reloaded on the next request after it changes.
+PALETTE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "static", "data", "colors.json"
+)
+
+# Saree color field → column holding its resolved hex
+SAREE_COLOR_FIELDS = {
+    "border_color": "border_hex",
+    "body_color": "body_hex",
+    "meena_a": "meena_a_hex",
+    "meena_b": "meena_b_hex",
+    "meena_c": "meena_c_hex",
+    "meena_d": "meena_d_hex",
+}
+
+
+class Palette:
+    """One loaded version of the palette asset."""
+
+    def __init__(self, body, mtime):
+        self.body = body
+        self.mtime = mtime
+        self.version = hashlib.sha1(body).hexdigest()[:12]
+        self.colors = json.loads(body)["colors"]
+        # Upper-cased code → palette key, for case-insensitive matching
+        self.keys = {name.upper(): name for name in self.colors}
+
+
+_palette = None
+_palette_lock = threading.Lock()
+
+
+def get_palette():
+    """The current palette, read once per process and again only when the file changes."""
+    global _palette
+
+    mtime = os.stat(PALETTE_PATH).st_mtime_ns
+    palette = _palette
+    if palette is not None and palette.mtime == mtime:
+        return palette
+
+    with _palette_lock:
+        if _palette is None or _palette.mtime != mtime:
+            with open(PALETTE_PATH, "rb") as f:
+                _palette = Palette(f.read(), mtime)
+        return _palette
+
+
+def resolve_color(value):
+    """
+    Canonical (name, hex) for a color as entered: a palette code such as
+    "12m", a CSS name or a "#rrggbb" value. hex is None when unknown.
+    """
+    if not value or not value.strip():
+        return None, None
+
+    value = value.strip()
+    palette = get_palette()
+
+    name = palette.keys.get(value.upper())
+    if name:
+        return name, palette.colors[name]
+
+    if value.startswith("#"):
+        try:
+            return value, webcolors.normalize_hex(value)
+        except ValueError:
+            return value, None
+
+    try:
+        return value, webcolors.name_to_hex(value)
+    except ValueError:
+        return value, None
+
+
+def _stored_value(obj, field):
+    """field as loaded from the database (None for an object not saved yet)."""
+    history = inspect(obj).attrs[field].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def apply_saree_colors(saree):
+    """
+    Store canonical color names and their hex on the saree (write time).
+    A name that can't be resolved keeps a hex submitted with it, or the
+    stored hex if the name itself didn't change; otherwise it has none.
+    """
+    for field, hex_field in SAREE_COLOR_FIELDS.items():
+        name, hex_value = resolve_color(getattr(saree, field))
+
+        if name and not hex_value:
+            if inspect(saree).attrs[hex_field].history.added:
+                hex_value = getattr(saree, hex_field)
+            elif name == _stored_value(saree, field):
+                hex_value = _stored_value(saree, hex_field)
+
+        setattr(saree, field, name)
+        setattr(saree, hex_field, hex_value or None)
+
+
+def resolve_saree_colors(values):
+    """apply_saree_colors for a dict of saree column values (bulk inserts)."""
+    for field, hex_field in SAREE_COLOR_FIELDS.items():
+        name, hex_value = resolve_color(values.get(field))
+        values[field] = name
+        values[hex_field] = hex_value or (values.get(hex_field) if name else None)
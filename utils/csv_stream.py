@@ -0,0 +1,111 @@
+import csv
+import io
+import zipfile
+from flask import Response, stream_with_context
+
+# Rows written per yielded chunk
+CSV_CHUNK_ROWS = 500
+
+
+def iter_csv(header, rows, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Encode rows as CSV lazily. The header is yielded straight away, then
+    one UTF-8 chunk per `chunk_rows` rows, so memory stays flat.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(header)
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def csv_response(filename, header, rows):
+    """Chunked text/csv attachment streamed from an iterable of rows."""
+    return Response(
+        stream_with_context(iter_csv(header, rows)),
+        mimetype="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+class _ZipSink:
+    """Write-only, unseekable sink that zipfile streams into."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip_csv(files):
+    """
+    Stream a zip archive of CSV files. `files` is a list of
+    (filename, header, rows); each file is compressed as it is encoded.
+    """
+    sink = _ZipSink()
+
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, header, rows in files:
+            with archive.open(filename, "w", force_zip64=True) as member:
+                for chunk in iter_csv(header, rows):
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+
+            yield sink.drain()
+
+    yield sink.drain()
+
+
+def zip_response(filename, files):
+    """Chunked application/zip attachment of several streamed CSV files."""
+    return Response(
+        stream_with_context(iter_zip_csv(files)),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+def iter_csv_upload(file):
+    """
+    (line number, row dict) for each row of an uploaded CSV, decoded and
+    parsed while it is read instead of loading the whole file.
+    """
+    text = io.TextIOWrapper(file.stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+
+    for row in reader:
+        yield reader.line_num, row
@@ -0,0 +1,62 @@
+import os
+from PIL import Image, ImageOps, features
+
+# Variant name → bounding box (px). Aspect ratio is kept.
+IMAGE_VARIANTS = {
+    "thumb": (320, 320),
+    "medium": (1024, 1024),
+}
+
+# Sub-folder of UPLOAD_FOLDER holding generated variants
+VARIANTS_DIR = "variants"
+
+# Uploads that are images (PDFs etc. get no variants)
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
+
+# WebP when Pillow was built with it, JPEG otherwise
+VARIANT_FORMAT, VARIANT_EXT = ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+VARIANT_QUALITY = 80
+
+
+def is_image(filename):
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in IMAGE_EXTENSIONS
+
+
+def make_image_variants(upload_folder, filename):
+    """
+    Generate the IMAGE_VARIANTS of an upload. Returns {variant: path} with
+    paths relative to upload_folder (like the original's filename); empty
+    when the file is not a readable image.
+    """
+    if not filename or not is_image(filename):
+        return {}
+
+    stem = os.path.splitext(filename)[0]
+    paths = {variant: f"{VARIANTS_DIR}/{stem}_{variant}.{VARIANT_EXT}" for variant in IMAGE_VARIANTS}
+
+    # Content-addressed uploads: the same file was already resized
+    full_paths = [os.path.join(upload_folder, path) for path in paths.values()]
+    if all(os.path.exists(full_path) for full_path in full_paths):
+        for full_path in full_paths:
+            # Like store_upload: keep them away from the orphan cleanup
+            os.utime(full_path)
+        return paths
+
+    os.makedirs(os.path.join(upload_folder, VARIANTS_DIR, os.path.dirname(stem)), exist_ok=True)
+
+    try:
+        with Image.open(os.path.join(upload_folder, filename)) as original:
+            # Phone photos carry their rotation in EXIF
+            image = ImageOps.exif_transpose(original)
+            image = image.convert("RGBA" if VARIANT_FORMAT == "WEBP" and "A" in image.getbands() else "RGB")
+
+            for variant, size in IMAGE_VARIANTS.items():
+                resized = image.copy()
+                resized.thumbnail(size, Image.LANCZOS)
+                resized.save(os.path.join(upload_folder, paths[variant]), VARIANT_FORMAT, quality=VARIANT_QUALITY)
+
+            return paths
+
+    except (OSError, Image.DecompressionBombError):
+        return {}
+
@@ -0,0 +1,83 @@
+import atexit
+import random
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PermanentJobError(Exception):
+    """Raised by a job for a failure retrying can't fix (missing configuration)."""
+
+
+class JobRunner:
+    """
+    Runs slow side effects (OTP email / SMS) off the request thread.
+
+    Backends (JOB_RUNNER):
+      "thread" – a pool of JOB_WORKERS threads; a failing job is retried up
+                 to JOB_MAX_RETRIES times with exponential backoff + jitter.
+      "inline" – run immediately in the caller, once (local dev, tests).
+
+    Jobs run inside an app context, so they can use mail, db and config.
+    A job raising PermanentJobError fails at once, without retries.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.backend = "inline"
+        self.max_retries = 0
+        self.backoff = 0
+        self._executor = None
+
+    def init_app(self, app):
+        self.app = app
+        self.backend = app.config["JOB_RUNNER"]
+        self.max_retries = app.config["JOB_MAX_RETRIES"]
+        self.backoff = app.config["JOB_RETRY_BACKOFF"]
+
+        if self.backend == "thread" and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=app.config["JOB_WORKERS"],
+                thread_name_prefix="job"
+            )
+            # Let queued deliveries finish when the worker process exits
+            atexit.register(self._executor.shutdown, wait=True)
+
+    def enqueue(self, func, *args, **kwargs):
+        """Schedule func(*args, **kwargs); returns immediately on the thread backend."""
+        if self.backend == "thread":
+            self._executor.submit(self._run, func, args, kwargs, 0)
+        else:
+            self._run(func, args, kwargs, 0, retry=False)
+
+    def _run(self, func, args, kwargs, attempt, retry=True):
+        try:
+            with self.app.app_context():
+                func(*args, **kwargs)
+
+        except PermanentJobError as e:
+            print(f"🔥 job {func.__name__} failed (not retried): {e}")
+            return
+
+        except Exception as e:
+            if not retry or attempt >= self.max_retries:
+                print(f"🔥 job {func.__name__} failed after {attempt + 1} attempt(s): {e}")
+                traceback.print_exc()
+                return
+
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"job {func.__name__} failed ({e}), retrying in {delay:.1f}s")
+
+            timer = threading.Timer(delay, self._retry, (func, args, kwargs, attempt + 1))
+            timer.daemon = True
+            timer.start()
+
+    def _retry(self, func, args, kwargs, attempt):
+        try:
+            self._executor.submit(self._run, func, args, kwargs, attempt)
+        except RuntimeError:
+            # Executor already shut down (process exiting)
+            print(f"🔥 job {func.__name__} dropped at shutdown")
+
+
+job_runner = JobRunner()
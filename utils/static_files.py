@@ -0,0 +1,101 @@
+import os
+import hashlib
+import mimetypes
+from flask import request, abort
+from werkzeug.security import safe_join
+
+# Fingerprinted / content-addressed static URLs never change content
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+# Content-addressed uploads (utils/uploads.py): the path already is the hash
+IMMUTABLE_PREFIXES = ("uploads/cas/", "uploads/variants/cas/")
+
+# User uploads (incl. Aadhaar scans) may only be cached by the browser
+PRIVATE_PREFIX = "uploads/"
+
+# filename → (mtime_ns, size, fingerprint)
+_fingerprints = {}
+
+
+def static_fingerprint(static_folder, filename):
+    """Short content hash of a static file, recomputed only when it changes."""
+    full_path = safe_join(static_folder, filename)
+    if full_path is None:
+        return None
+
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+
+    cached = _fingerprints.get(filename)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    digest = hashlib.sha1()
+    with open(full_path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+
+    fingerprint = digest.hexdigest()[:10]
+    _fingerprints[filename] = (stat.st_mtime_ns, stat.st_size, fingerprint)
+    return fingerprint
+
+
+def init_static_files(app):
+    """
+    url_for('static', filename=...) gets a ?v=<content hash>; responses for
+    fingerprinted or content-addressed files are cached as immutable, the
+    rest revalidate through their ETag. Uploads are cached privately only.
+    With STATIC_ACCEL_REDIRECT_PREFIX set, nginx serves the file without
+    Flask opening it (X-Sendfile is Flask's USE_X_SENDFILE).
+    """
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint != "static" or "v" in values:
+            return
+
+        filename = values.get("filename", "")
+        if filename.startswith(IMMUTABLE_PREFIXES):
+            return
+
+        fingerprint = static_fingerprint(app.static_folder, filename)
+        if fingerprint:
+            values["v"] = fingerprint
+
+    @app.before_request
+    def static_accel_redirect():
+        prefix = app.config.get("STATIC_ACCEL_REDIRECT_PREFIX")
+        if not prefix or request.endpoint != "static" or app.config.get("USE_X_SENDFILE"):
+            return None
+
+        filename = request.view_args.get("filename", "")
+        if safe_join(app.static_folder, filename) is None:
+            abort(404)
+
+        # Empty body: nginx reads the file; caching headers are added below
+        response = app.response_class()
+        response.mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + filename
+        return response
+
+    @app.after_request
+    def static_cache_headers(response):
+        if request.endpoint != "static":
+            return response
+
+        filename = request.view_args.get("filename", "")
+        version = request.args.get("v")
+        scope = "private" if filename.startswith(PRIVATE_PREFIX) else "public"
+
+        if filename.startswith(IMMUTABLE_PREFIXES) or (
+            version and version == static_fingerprint(app.static_folder, filename)
+        ):
+            response.headers["Cache-Control"] = f"{scope}, max-age={STATIC_MAX_AGE}, immutable"
+        elif scope == "private":
+            response.headers["Cache-Control"] = "private, no-cache"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+
+        return response
@@ -0,0 +1,120 @@
+import os
+import time
+import hashlib
+import tempfile
+from sqlalchemy import select, func
+
+# Content-addressed store under UPLOAD_FOLDER: cas/ab/cd/<sha256>.<ext>
+UPLOAD_STORE_DIR = "cas"
+UPLOAD_TMP_DIR = "cas/tmp"
+
+# Files touched more recently than this are never deleted: a concurrent
+# request may have just stored (or deduplicated onto) them and not yet
+# committed the row that references them.
+UPLOAD_GRACE_SECONDS = 3600
+
+CHUNK_SIZE = 64 * 1024
+
+
+def upload_reference_columns():
+    """Every column holding an UPLOAD_FOLDER-relative path."""
+    from models.loom import SareeEntry
+    from models.weaver import Weaver
+
+    return [
+        SareeEntry.saree_image,
+        SareeEntry.saree_thumb,
+        SareeEntry.saree_medium,
+        Weaver.aadharcard,
+    ]
+
+
+def store_upload(file, upload_folder):
+    """
+    Stream an uploaded file into the store and return its path relative to
+    upload_folder. Identical content maps to the same path, so a duplicate
+    upload only refreshes the existing file's mtime.
+    """
+    ext = file.filename.rsplit(".", 1)[1].lower()
+    ext = "jpg" if ext == "jpeg" else ext
+
+    tmp_dir = os.path.join(upload_folder, UPLOAD_TMP_DIR)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha = digest.hexdigest()
+        path = f"{UPLOAD_STORE_DIR}/{sha[:2]}/{sha[2:4]}/{sha}.{ext}"
+        full_path = os.path.join(upload_folder, path)
+
+        if os.path.exists(full_path):
+            # Keeps it out of reach of the orphan cleanup for a while
+            os.utime(full_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, full_path)
+            tmp_path = None
+
+        return path
+
+    finally:
+        if tmp_path:
+            os.remove(tmp_path)
+
+
+def upload_ref_count(path):
+    """Number of rows (across upload_reference_columns) referencing path."""
+    from app import db
+
+    counts = [
+        select(func.count()).where(column == path).scalar_subquery()
+        for column in upload_reference_columns()
+    ]
+    return sum(db.session.execute(select(*counts)).one())
+
+
+def referenced_uploads():
+    """Set of every upload path referenced by some row."""
+    from app import db
+
+    referenced = set()
+    for column in upload_reference_columns():
+        rows = db.session.execute(select(column).where(column.isnot(None)).distinct())
+        referenced.update(row[0] for row in rows)
+    return referenced
+
+
+def is_stale(full_path):
+    """True when full_path exists and is older than UPLOAD_GRACE_SECONDS."""
+    try:
+        return time.time() - os.stat(full_path).st_mtime > UPLOAD_GRACE_SECONDS
+    except FileNotFoundError:
+        return False
+
+
+def release_uploads(upload_folder, *paths):
+    """
+    Call after committing a change that dropped references to paths.
+    Deletes the ones no row references any more; files still inside the
+    grace period are left to the orphan cleanup job.
+    """
+    root = os.path.realpath(upload_folder)
+
+    for path in set(filter(None, paths)):
+        full_path = os.path.realpath(os.path.join(root, path))
+        if not full_path.startswith(root + os.sep):
+            continue
+
+        if upload_ref_count(path) == 0 and is_stale(full_path):
+            try:
+                os.remove(full_path)
+            except FileNotFoundError:
+                pass